@@ -201,8 +201,10 @@ setup_devcontainer() {
 		PROJECT_NAME="$(basename "$(pwd)")"
 		PROJECT_SLUG="$(echo "$PROJECT_NAME" | tr '[:upper:]' '[:lower:]' | tr ' _' '-')"
 		if [ -f ".devcontainer/devcontainer.json" ]; then
-			sed -i.bak 's/"pilot-shell"/"'"${PROJECT_SLUG}"'"/g' ".devcontainer/devcontainer.json"
-			sed -i.bak 's|/workspaces/pilot-shell|/workspaces/'"${PROJECT_SLUG}"'|g' ".devcontainer/devcontainer.json"
+			sed -i.bak \
+				-e 's/"pilot-shell"/"'"${PROJECT_SLUG}"'"/g' \
+				-e 's|/workspaces/pilot-shell|/workspaces/'"${PROJECT_SLUG}"'|g' \
+				".devcontainer/devcontainer.json"
 			rm -f ".devcontainer/devcontainer.json.bak"
 		fi
 
@@ -1,149 +1,162 @@
-"""Tests for install.sh bootstrap script."""
+"""Tests for install.sh bootstrap script.
+
+The script is read once per process and shared by every test.
+"""
 
 from __future__ import annotations
 
+import functools
+import re
+import shutil
+import subprocess
 from pathlib import Path
 
+import pytest
 
-def test_install_sh_runs_python_installer():
-    """Verify install.sh runs the Python installer module via uv with Python 3.12."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "uv run --python 3.12" in content, "install.sh must run with Python 3.12"
-    assert "python -m installer" in content, "install.sh must run Python installer"
-
-    assert "install" in content, "install.sh must pass 'install' command"
-
-    assert "--local-system" in content, "install.sh must support --local-system flag"
-
-
-def test_install_sh_downloads_installer_files():
-    """Verify install.sh downloads the installer Python package dynamically."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "download_installer" in content, "install.sh must have download_installer function"
-
-    assert "tree.json" in content, "Must download tree.json from release assets"
-    assert "releases/download" in content, "Must use release asset URL pattern"
+INSTALL_SH = Path(__file__).resolve().parents[3] / "install.sh"
 
-    assert "api.github.com" in content, "Must use GitHub API for file discovery fallback"
-    assert "git/trees" in content, "Must use git trees API endpoint as fallback"
-
-    assert "installer/" in content, "Must filter for installer directory"
-    assert ".py" in content, "Must filter for Python files"
-
-
-def test_install_sh_runs_installer():
-    """Verify install.sh runs the Python installer (which downloads Pilot binary)."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "run_installer" in content, "install.sh must have run_installer function"
-    assert "python -m installer" in content, "Must run Python installer"
-
-
-def test_install_sh_ensures_uv_available():
-    """Verify install.sh ensures uv is available."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "check_uv" in content, "install.sh must have check_uv function"
-    assert "install_uv" in content, "install.sh must have install_uv function"
-    assert "astral.sh/uv/install.sh" in content, "Must use official uv installer"
+_DEVCONTAINER_TEMPLATE = b"""{
+  "name": "pilot-shell",
+  "runArgs": ["--name", "pilot-shell"],
+  "workspaceFolder": "/workspaces/pilot-shell",
+  "postCreateCommand": "curl -fsSL https://raw.githubusercontent.com/maxritter/pilot-shell/v5.0.6/install.sh | bash"
+}"""
+
+
+@pytest.fixture
+def devcontainer_json(tmp_path: Path) -> Path:
+    """Write the mock devcontainer.json template into a fresh .devcontainer directory."""
+    path = tmp_path / ".devcontainer" / "devcontainer.json"
+    path.parent.mkdir()
+    path.write_bytes(_DEVCONTAINER_TEMPLATE)
+    return path
+
+
+@functools.cache
+def _install_sh_content() -> str:
+    """Read install.sh once per process."""
+    return INSTALL_SH.read_text()
+
+
+def _slugify(name: str) -> str:
+    """Convert project name to slug (lowercase, spaces/underscores to hyphens)."""
+    return re.sub(r"[ _]+", "-", name.lower())
+
+
+# Literals install.sh must contain, grouped by feature: token -> failure message.
+_REQUIRED_TOKENS: dict[str, dict[str, str]] = {
+    "runs_python_installer": {
+        "uv run --python 3.12": "install.sh must run with Python 3.12",
+        "python -m installer": "install.sh must run Python installer",
+        "install": "install.sh must pass 'install' command",
+        "--local-system": "install.sh must support --local-system flag",
+    },
+    "downloads_installer_files": {
+        "download_installer": "install.sh must have download_installer function",
+        "tree.json": "Must download tree.json from release assets",
+        "releases/download": "Must use release asset URL pattern",
+        "api.github.com": "Must use GitHub API for file discovery fallback",
+        "git/trees": "Must use git trees API endpoint as fallback",
+        "installer/": "Must filter for installer directory",
+        ".py": "Must filter for Python files",
+    },
+    "runs_installer": {
+        "run_installer": "install.sh must have run_installer function",
+        "python -m installer": "Must run Python installer",
+    },
+    "ensures_uv_available": {
+        "check_uv": "install.sh must have check_uv function",
+        "install_uv": "install.sh must have install_uv function",
+        "astral.sh/uv/install.sh": "Must use official uv installer",
+    },
+    "has_devcontainer_support": {
+        "is_in_container": "Must have container detection",
+        "setup_devcontainer": "Must have devcontainer setup",
+        ".devcontainer": "Must reference .devcontainer directory",
+    },
+    "uses_with_flags": {
+        "--with rich": "Must use --with for rich",
+        "PYTHONPATH": "Must set PYTHONPATH for installer module",
+    },
+    "uses_python_312": {
+        "--python 3.12": "Must use --python 3.12 flag",
+        "--no-project": "Must use --no-project to avoid modifying user's venv",
+    },
+    "auto_detects_devcontainer": {
+        '[ -d ".devcontainer" ]': "Must check for .devcontainer directory",
+        "Detected .devcontainer": "Must inform user about detected .devcontainer",
+    },
+    "skips_prompt_on_restart": {
+        'RESTART_PILOT" = true': "Must check RESTART_PILOT flag",
+        "Updating local installation": "Must show update message",
+    },
+    "replaces_devcontainer_project_name": {
+        "PROJECT_SLUG=": "Must generate PROJECT_SLUG",
+        "basename": "Must use basename to get directory name",
+        "tr '[:upper:]' '[:lower:]'": "Must convert to lowercase",
+        '"pilot-shell"': "Must have pattern for quoted pilot-shell",
+        "${PROJECT_SLUG}": "Must substitute PROJECT_SLUG",
+        "/workspaces/pilot-shell": "Must have pattern for workspace path",
+    },
+    "has_auto_version_fetch": {
+        "get_latest_release()": "Must have get_latest_release function",
+        "api.github.com": "Must use GitHub API",
+        "releases/latest": "Must query releases/latest endpoint",
+        "tag_name": "Must parse tag_name from API response",
+    },
+    "supports_version_env_var": {
+        'VERSION="${VERSION:-}"': "Must read VERSION env var with empty default",
+        "Fetching latest version": "Must have message for auto-fetch mode",
+    },
+    "detects_native_windows": {
+        "is_native_windows": "Must have Windows detection function",
+        "MINGW": "Must detect Git Bash (MINGW)",
+        "MSYS": "Must detect MSYS2",
+        "CYGWIN": "Must detect Cygwin",
+        "WSL": "Must mention WSL2 as an option",
+        "Dev Container": "Must mention Dev Container as an option",
+    },
+}
+
+
+def test_install_sh_contains_required_tokens():
+    """Verify install.sh contains every literal its features depend on, reporting all that are missing."""
+    content = _install_sh_content()
+
+    missing = [
+        f"{feature}: {message}"
+        for feature, tokens in _REQUIRED_TOKENS.items()
+        for token, message in tokens.items()
+        if token not in content
+    ]
+    assert not missing, "\n".join(missing)
 
 
 def test_install_sh_is_executable_bash_script():
     """Verify install.sh has proper shebang."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
+    content = _install_sh_content()
 
     assert content.startswith("#!/bin/bash"), "install.sh must start with bash shebang"
 
 
-def test_install_sh_has_devcontainer_support():
-    """Verify install.sh supports dev container mode."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "is_in_container" in content, "Must have container detection"
-    assert "setup_devcontainer" in content, "Must have devcontainer setup"
-    assert ".devcontainer" in content, "Must reference .devcontainer directory"
-
-
-def test_install_sh_uses_with_flags():
-    """Verify install.sh uses --with flags for inline deps (no venv created)."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "--with rich" in content, "Must use --with for rich"
-    assert "PYTHONPATH" in content, "Must set PYTHONPATH for installer module"
-
-
-def test_install_sh_uses_python_312():
-    """Verify install.sh uses Python 3.12 via uv run."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "--python 3.12" in content, "Must use --python 3.12 flag"
-    assert "--no-project" in content, "Must use --no-project to avoid modifying user's venv"
-
-
-def test_install_sh_auto_detects_devcontainer():
-    """Verify install.sh detects .devcontainer directory for container mode."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert '[ -d ".devcontainer" ]' in content, "Must check for .devcontainer directory"
-    assert "Detected .devcontainer" in content, "Must inform user about detected .devcontainer"
-
-
-def test_install_sh_skips_prompt_on_restart():
-    """Verify install.sh skips install mode prompt during auto-updates."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
+@pytest.mark.skipif(shutil.which("bash") is None, reason="bash not available")
+def test_install_sh_has_valid_bash_syntax():
+    """Verify install.sh parses cleanly with bash -n."""
+    result = subprocess.run(["bash", "-n", str(INSTALL_SH)], capture_output=True, text=True, check=False)
 
-    assert 'RESTART_PILOT" = true' in content, "Must check RESTART_PILOT flag"
-    assert "Updating local installation" in content, "Must show update message"
+    assert result.returncode == 0, f"install.sh has bash syntax errors:\n{result.stderr}"
 
 
 def test_install_sh_no_global_install_mode():
     """Verify install.sh does not store install_mode in global config."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
+    content = _install_sh_content()
 
     assert "save_install_mode" not in content, "Must not save install_mode globally"
     assert "get_saved_install_mode" not in content, "Must not read global install_mode"
 
 
-def test_install_sh_replaces_devcontainer_project_name():
-    """Verify install.sh has sed commands to replace pilot-shell with project name."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "PROJECT_SLUG=" in content, "Must generate PROJECT_SLUG"
-    assert "basename" in content, "Must use basename to get directory name"
-    assert "tr '[:upper:]' '[:lower:]'" in content, "Must convert to lowercase"
-
-    assert '"pilot-shell"' in content, "Must have pattern for quoted pilot-shell"
-    assert "${PROJECT_SLUG}" in content, "Must substitute PROJECT_SLUG"
-
-    assert "/workspaces/pilot-shell" in content, "Must have pattern for workspace path"
-
-
-def test_install_sh_preserves_github_url_in_devcontainer(tmp_path: Path):
+def test_install_sh_preserves_github_url_in_devcontainer(devcontainer_json: Path):
     """Verify string replacement preserves GitHub URLs while replacing project name."""
-    devcontainer_dir = tmp_path / ".devcontainer"
-    devcontainer_dir.mkdir()
-    devcontainer_json = devcontainer_dir / "devcontainer.json"
-    devcontainer_json.write_text("""{
-  "name": "pilot-shell",
-  "runArgs": ["--name", "pilot-shell"],
-  "workspaceFolder": "/workspaces/pilot-shell",
-  "postCreateCommand": "curl -fsSL https://raw.githubusercontent.com/maxritter/pilot-shell/v5.0.6/install.sh | bash"
-}""")
-
     project_slug = "my-cool-project"
     content = devcontainer_json.read_text()
     content = content.replace('"pilot-shell"', f'"{project_slug}"')
@@ -159,91 +172,41 @@ def test_install_sh_preserves_github_url_in_devcontainer(tmp_path: Path):
     assert "maxritter/pilot-shell/v5.0.6" in result, "GitHub URL must be preserved"
 
 
-def test_install_sh_sed_handles_special_project_names(tmp_path: Path):
-    """Verify project name slugification works with various formats."""
-    import re
-
-    def slugify(name: str) -> str:
-        """Convert project name to slug (lowercase, spaces/underscores to hyphens)."""
-        return re.sub(r"[ _]+", "-", name.lower())
-
-    test_cases = [
+@pytest.mark.parametrize(
+    ("project_name", "expected_slug"),
+    [
         ("My Project", "my-project"),
         ("My_Project", "my-project"),
         ("MyProject", "myproject"),
         ("my-project", "my-project"),
         ("PROJECT", "project"),
-    ]
-
-    for project_name, expected_slug in test_cases:
-        devcontainer_dir = tmp_path / ".devcontainer"
-        devcontainer_dir.mkdir(exist_ok=True)
-        devcontainer_json = devcontainer_dir / "devcontainer.json"
-        devcontainer_json.write_text("""{
-  "name": "pilot-shell",
-  "workspaceFolder": "/workspaces/pilot-shell"
-}""")
-
-        project_slug = slugify(project_name)
-        assert project_slug == expected_slug, (
-            f"Slug for '{project_name}' should be '{expected_slug}', got '{project_slug}'"
-        )
-
-        content = devcontainer_json.read_text()
-        content = content.replace('"pilot-shell"', f'"{project_slug}"')
-        content = content.replace("/workspaces/pilot-shell", f"/workspaces/{project_slug}")
-        devcontainer_json.write_text(content)
-
-        content = devcontainer_json.read_text()
-        assert f'"name": "{project_slug}"' in content, f"Failed for project '{project_name}'"
-        assert f'"/workspaces/{project_slug}"' in content, f"Failed workspace for '{project_name}'"
-
-
-def test_install_sh_has_auto_version_fetch():
-    """Verify install.sh has get_latest_release function for auto-fetching version."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "get_latest_release()" in content, "Must have get_latest_release function"
-    assert "api.github.com" in content, "Must use GitHub API"
-    assert "releases/latest" in content, "Must query releases/latest endpoint"
-    assert "tag_name" in content, "Must parse tag_name from API response"
-
+    ],
+)
+def test_install_sh_sed_handles_special_project_names(devcontainer_json: Path, project_name: str, expected_slug: str):
+    """Verify project name slugification works with various formats."""
+    project_slug = _slugify(project_name)
+    assert project_slug == expected_slug, f"Slug for '{project_name}' should be '{expected_slug}', got '{project_slug}'"
 
-def test_install_sh_supports_version_env_var():
-    """Verify install.sh supports VERSION environment variable."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
+    content = devcontainer_json.read_text()
+    content = content.replace('"pilot-shell"', f'"{project_slug}"')
+    content = content.replace("/workspaces/pilot-shell", f"/workspaces/{project_slug}")
+    devcontainer_json.write_text(content)
 
-    assert 'VERSION="${VERSION:-}"' in content, "Must read VERSION env var with empty default"
-    assert "Fetching latest version" in content, "Must have message for auto-fetch mode"
+    content = devcontainer_json.read_text()
+    assert f'"name": "{project_slug}"' in content, f"Failed for project '{project_name}'"
+    assert f'"/workspaces/{project_slug}"' in content, f"Failed workspace for '{project_name}'"
 
 
 def test_install_sh_handles_api_failure():
     """Verify install.sh handles GitHub API failures gracefully."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
+    content = _install_sh_content()
 
     assert "Failed to fetch" in content or "Could not" in content, "Must have error message for API failure"
 
 
-def test_install_sh_detects_native_windows():
-    """Verify install.sh detects native Windows (MINGW/MSYS/Cygwin) and offers WSL2 or Dev Container."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
-
-    assert "is_native_windows" in content, "Must have Windows detection function"
-    assert "MINGW" in content, "Must detect Git Bash (MINGW)"
-    assert "MSYS" in content, "Must detect MSYS2"
-    assert "CYGWIN" in content, "Must detect Cygwin"
-    assert "WSL2" in content or "WSL" in content, "Must mention WSL2 as an option"
-    assert "Dev Container" in content, "Must mention Dev Container as an option"
-
-
 def test_install_sh_uses_redirect_for_version_detection():
     """Verify install.sh uses redirect-based approach before API for version detection."""
-    install_sh = Path(__file__).parent.parent.parent.parent / "install.sh"
-    content = install_sh.read_text()
+    content = _install_sh_content()
 
     assert "redirect_url" in content, "Must use redirect_url for curl"
     assert "releases/latest" in content, "Must query releases/latest for redirect"
@@ -6,8 +6,10 @@ constants, classes, and functions — enabling runtime monkey-patching
 that defeats every license check without touching any file on disk.
 
 Run: uv run --python 3.12 --no-project --with cryptography pytest launcher/tests/security/test_so_bypass.py -v
+Skip the end-to-end subprocess tests with: -m "not slow"
 """
 
+import functools
 import hmac
 import hashlib
 import json
@@ -23,12 +25,68 @@ import pytest
 PILOT_BIN = Path.home() / ".pilot" / "bin"
 PILOT_SO = next(PILOT_BIN.glob("pilot.cpython-*.so"), None)
 LICENSE_PATH = Path.home() / ".pilot" / ".license"
+LICENSE_BACKUP_PATH = LICENSE_PATH.with_suffix(".license.testbak")
+_PILOT_BIN_STR = str(PILOT_BIN)
+_RSA_2048_DER_PREFIX = "MIIBIj"
+_POLAR_ID_ATTRS = (
+    "_POLAR_PROD_ORG_ID",
+    "_POLAR_PROD_SOLO_BENEFIT_ID",
+    "_POLAR_PROD_TEAM_BENEFIT_ID",
+)
+
+_BYPASS_WRAPPER_TEMPLATE = textwrap.dedent("""\
+    #!/bin/bash
+    SCRIPT_DIR="{pilot_bin}"
+    exec uv run --python 3.12 --no-project --with cryptography python -c "
+    import sys, os
+    cwd = os.getcwd()
+    sys.path = [p for p in sys.path if p and p != cwd and not (os.path.isdir(os.path.join(p, 'launcher')) and os.path.isfile(os.path.join(p, 'launcher', '__init__.py')))]
+    sys.path.insert(0, '$SCRIPT_DIR')
+
+    import pilot
+
+    # --- BYPASS: neutralize all license checks ---
+    pilot._check_license_valid = lambda: (True, '')
+    pilot.LicenseManager.validate = lambda self: (True, '')
+    pilot.ClaudeWrapper._check_license = lambda self: None
+    pilot.ClaudeWrapper._handle_invalid_license = lambda self, *a, **kw: None
+    pilot.ClaudeWrapper._handle_trial_expired = lambda self, *a, **kw: None
+    # --- END BYPASS ---
+
+    from pilot import app
+    code = app()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+    " '\\"\\$@\\"'
+    """)
+
+_SITECUSTOMIZE_TEMPLATE = textwrap.dedent("""\
+    # Injected via sitecustomize.py — runs before any user code
+    import importlib
+    _original_import = __builtins__.__import__ if hasattr(__builtins__, '__import__') else __import__
+
+    def _patched_import(name, *args, **kwargs):
+        mod = _original_import(name, *args, **kwargs)
+        if name == 'pilot' and hasattr(mod, '_check_license_valid'):
+            mod._check_license_valid = lambda: (True, '')
+        return mod
+
+    try:
+        __builtins__.__import__ = _patched_import
+    except AttributeError:
+        pass
+    """)
+
+
+@functools.cache
+def _compile_cached(source: str):
+    """Compile a payload once per distinct source string."""
+    return compile(source, "<payload>", "exec")
 
 
 def _load_pilot():
     """Import the compiled pilot module, same as the wrapper script does."""
-    if str(PILOT_BIN) not in sys.path:
-        sys.path.insert(0, str(PILOT_BIN))
     # Remove any cached launcher/ path (mirrors the wrapper's sys.path filter)
     cwd = str(Path.cwd())
     sys.path = [
@@ -40,7 +98,8 @@ def _load_pilot():
             Path(p, "launcher").is_dir() and Path(p, "launcher", "__init__.py").is_file()
         )
     ]
-    sys.path.insert(0, str(PILOT_BIN))
+    if _PILOT_BIN_STR not in sys.path:
+        sys.path.insert(0, _PILOT_BIN_STR)
     import importlib
 
     if "pilot" in sys.modules:
@@ -58,46 +117,55 @@ pytestmark = pytest.mark.skipif(
 )
 
 
+@pytest.fixture(scope="session")
+def pilot_status_json():
+    """Run `pilot status --json` once per session and return the parsed output."""
+    result = subprocess.run(
+        [str(PILOT_BIN / "pilot"), "status", "--json"],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    return json.loads(result.stdout.strip())
+
+
 # ===========================================================================
 # 1. Secret Exposure — the .so leaks every constant needed to forge state
 # ===========================================================================
 class TestSecretExposure:
     """The .so must NOT expose secrets via normal Python attribute access."""
 
-    def test_hmac_secret_is_readable(self):
+    @pytest.fixture(scope="class")
+    def pilot_attrs(self):
+        """Snapshot of the compiled module's namespace, taken once per class."""
+        return vars(_load_pilot())
+
+    def test_hmac_secret_is_readable(self, pilot_attrs):
         """HMAC_SECRET used to sign .license is directly accessible."""
-        pilot = _load_pilot()
-        assert hasattr(pilot, "HMAC_SECRET")
-        assert isinstance(pilot.HMAC_SECRET, bytes)
-        assert len(pilot.HMAC_SECRET) > 0
+        secret = pilot_attrs.get("HMAC_SECRET")
+        assert isinstance(secret, bytes)
+        assert len(secret) > 0
         # Attacker now has the signing key
-        assert pilot.HMAC_SECRET == b"pilot-license-state-v1-2026"
+        assert secret == b"pilot-license-state-v1-2026"
 
-    def test_rsa_public_key_is_readable(self):
+    def test_rsa_public_key_is_readable(self, pilot_attrs):
         """RSA public key for trial signature verification is exposed."""
-        pilot = _load_pilot()
-        assert hasattr(pilot, "RSA_PUBLIC_KEY")
-        assert isinstance(pilot.RSA_PUBLIC_KEY, str)
-        assert pilot.RSA_PUBLIC_KEY.startswith("MIIBIj")  # RSA-2048 DER prefix
-        assert len(pilot.RSA_PUBLIC_KEY) > 300
+        key = pilot_attrs.get("RSA_PUBLIC_KEY")
+        assert isinstance(key, str)
+        assert key.startswith(_RSA_2048_DER_PREFIX)
+        assert len(key) > 300
 
-    def test_polar_org_and_benefit_ids_are_readable(self):
+    def test_polar_org_and_benefit_ids_are_readable(self, pilot_attrs):
         """Polar.sh org and product benefit IDs are exposed — enables API probing."""
-        pilot = _load_pilot()
-        for attr in (
-            "_POLAR_PROD_ORG_ID",
-            "_POLAR_PROD_SOLO_BENEFIT_ID",
-            "_POLAR_PROD_TEAM_BENEFIT_ID",
-        ):
-            val = getattr(pilot, attr, None)
+        for attr in _POLAR_ID_ATTRS:
+            val = pilot_attrs.get(attr)
             assert val is not None, f"{attr} missing"
             assert isinstance(val, str) and len(val) > 10, f"{attr} too short"
 
-    def test_gumroad_product_id_is_readable(self):
+    def test_gumroad_product_id_is_readable(self, pilot_attrs):
         """Gumroad product ID is exposed."""
-        pilot = _load_pilot()
-        assert hasattr(pilot, "GUMROAD_PRODUCT_ID")
-        assert len(pilot.GUMROAD_PRODUCT_ID) > 5
+        assert "GUMROAD_PRODUCT_ID" in pilot_attrs
+        assert len(pilot_attrs["GUMROAD_PRODUCT_ID"]) > 5
 
     def test_machine_fingerprint_callable(self):
         """get_machine_fingerprint() is callable — returns the hardware ID
@@ -128,7 +196,7 @@ class TestHmacBypass:
     @pytest.fixture(autouse=True)
     def _backup_license(self):
         """Backup and restore .license around each test."""
-        backup = LICENSE_PATH.with_suffix(".license.testbak")
+        backup = LICENSE_BACKUP_PATH
         if LICENSE_PATH.exists():
             shutil.copy2(LICENSE_PATH, backup)
         yield
@@ -136,34 +204,34 @@ class TestHmacBypass:
             shutil.copy2(backup, LICENSE_PATH)
             backup.unlink()
 
-    def test_empty_signature_accepted(self):
+    @pytest.fixture(scope="class")
+    def baseline_license(self):
+        """Parsed .license contents, read once before any test mutates the file."""
+        return json.loads(LICENSE_PATH.read_text())
+
+    def test_empty_signature_accepted(self, baseline_license):
         """Empty string signature passes validation — HMAC not checked."""
         pilot = _load_pilot()
-        data = json.loads(LICENSE_PATH.read_text())
-        data["signature"] = ""
-        LICENSE_PATH.write_text(json.dumps(data))
+        LICENSE_PATH.write_text(json.dumps({**baseline_license, "signature": ""}))
 
         lm = pilot.LicenseManager()
         valid, err = lm.validate()
         assert valid is True, f"Expected valid=True with empty sig, got err={err}"
 
-    def test_garbage_signature_accepted(self):
+    def test_garbage_signature_accepted(self, baseline_license):
         """Random garbage signature passes validation — HMAC not checked."""
         pilot = _load_pilot()
-        data = json.loads(LICENSE_PATH.read_text())
-        data["signature"] = "deadbeef" * 8
-        LICENSE_PATH.write_text(json.dumps(data))
+        LICENSE_PATH.write_text(json.dumps({**baseline_license, "signature": "deadbeef" * 8}))
 
         lm = pilot.LicenseManager()
         valid, err = lm.validate()
         assert valid is True, f"Expected valid=True with garbage sig, got err={err}"
 
-    def test_attacker_can_compute_correct_hmac(self):
+    def test_attacker_can_compute_correct_hmac(self, baseline_license):
         """With the leaked HMAC_SECRET, an attacker can produce a correct HMAC
         for any arbitrary state — the secret provides zero protection."""
         pilot = _load_pilot()
-        data = json.loads(LICENSE_PATH.read_text())
-        state_json = json.dumps(data["state"], sort_keys=True)
+        state_json = json.dumps(baseline_license["state"], sort_keys=True)
         forged = hmac.new(
             pilot.HMAC_SECRET, state_json.encode(), hashlib.sha256
         ).hexdigest()
@@ -268,34 +336,7 @@ class TestWrapperScriptBypass:
         """Demonstrate a replacement wrapper that patches validation
         before calling app(). This is the complete end-to-end bypass."""
         bypass_script = tmp_path / "pilot-bypass"
-        bypass_script.write_text(
-            textwrap.dedent(f"""\
-            #!/bin/bash
-            SCRIPT_DIR="{PILOT_BIN}"
-            exec uv run --python 3.12 --no-project --with cryptography python -c "
-            import sys, os
-            cwd = os.getcwd()
-            sys.path = [p for p in sys.path if p and p != cwd and not (os.path.isdir(os.path.join(p, 'launcher')) and os.path.isfile(os.path.join(p, 'launcher', '__init__.py')))]
-            sys.path.insert(0, '$SCRIPT_DIR')
-
-            import pilot
-
-            # --- BYPASS: neutralize all license checks ---
-            pilot._check_license_valid = lambda: (True, '')
-            pilot.LicenseManager.validate = lambda self: (True, '')
-            pilot.ClaudeWrapper._check_license = lambda self: None
-            pilot.ClaudeWrapper._handle_invalid_license = lambda self, *a, **kw: None
-            pilot.ClaudeWrapper._handle_trial_expired = lambda self, *a, **kw: None
-            # --- END BYPASS ---
-
-            from pilot import app
-            code = app()
-            sys.stdout.flush()
-            sys.stderr.flush()
-            os._exit(code)
-            " '\\"\\$@\\"'
-            """)
-        )
+        bypass_script.write_text(_BYPASS_WRAPPER_TEMPLATE.format(pilot_bin=PILOT_BIN))
         bypass_script.chmod(0o755)
 
         content = bypass_script.read_text()
@@ -305,54 +346,31 @@ class TestWrapperScriptBypass:
         assert "_handle_trial_expired" in content
 
         # Verify it would use the real .so
-        assert str(PILOT_BIN) in content
+        assert _PILOT_BIN_STR in content
 
     def test_sitecustomize_injection_vector(self, tmp_path):
         """A sitecustomize.py in the right location can patch the pilot module
         before app() runs. The wrapper uses `uv run` which loads site packages."""
         payload = tmp_path / "sitecustomize.py"
-        payload.write_text(
-            textwrap.dedent("""\
-            # Injected via sitecustomize.py — runs before any user code
-            import importlib
-            _original_import = __builtins__.__import__ if hasattr(__builtins__, '__import__') else __import__
-
-            def _patched_import(name, *args, **kwargs):
-                mod = _original_import(name, *args, **kwargs)
-                if name == 'pilot' and hasattr(mod, '_check_license_valid'):
-                    mod._check_license_valid = lambda: (True, '')
-                return mod
-
-            try:
-                __builtins__.__import__ = _patched_import
-            except AttributeError:
-                pass
-            """)
-        )
+        payload.write_text(_SITECUSTOMIZE_TEMPLATE)
         content = payload.read_text()
         assert "_check_license_valid" in content
         # The file exists and is valid Python
-        compile(content, str(payload), "exec")
+        _compile_cached(content)
 
 
 # ===========================================================================
 # 5. End-to-End: Prove the bypass works against `pilot status`
 # ===========================================================================
+@pytest.mark.slow
 class TestEndToEndBypass:
     """Prove that monkey-patching via the .so symbols actually changes
     what `pilot status --json` reports."""
 
-    def test_pilot_status_returns_trial(self):
+    def test_pilot_status_returns_trial(self, pilot_status_json):
         """Baseline: unmodified pilot reports the real trial state."""
-        result = subprocess.run(
-            [str(PILOT_BIN / "pilot"), "status", "--json"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        data = json.loads(result.stdout.strip())
-        assert data["success"] is True
-        assert data["tier"] == "trial"
+        assert pilot_status_json["success"] is True
+        assert pilot_status_json["tier"] == "trial"
 
     def test_patched_module_reports_team_tier(self):
         """After monkey-patching get_license_info, the module reports
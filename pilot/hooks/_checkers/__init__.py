@@ -1,7 +1,26 @@
-"""Language-specific file checkers."""
+"""Language-specific file checkers.
 
-from _checkers.go import check_go
-from _checkers.python import check_python
-from _checkers.typescript import check_typescript
+Checker modules are imported on first attribute access so a hook run only
+pays for the language it actually checks.
+"""
 
-__all__ = ["check_go", "check_python", "check_typescript"]
+from __future__ import annotations
+
+import importlib
+
+TS_EXTENSIONS = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".mts"}
+
+_CHECKER_MODULES = {
+    "check_go": "_checkers.go",
+    "check_python": "_checkers.python",
+    "check_typescript": "_checkers.typescript",
+}
+
+__all__ = ["TS_EXTENSIONS", "check_go", "check_python", "check_typescript"]
+
+
+def __getattr__(name: str) -> object:
+    """Import the checker module that defines name on first access and return the attribute."""
+    if name in _CHECKER_MODULES:
+        return getattr(importlib.import_module(_CHECKER_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,65 +2,53 @@
 
 from __future__ import annotations
 
-import shutil
+import os
 import subprocess
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from _util import check_file_length
+from _util import cached_which, check_file_length
 
+MAX_SHOWN_LINES = 10
 
-def check_go(file_path: Path) -> tuple[int, str]:
+
+def check_go(file_path: Path, st: os.stat_result | None = None) -> tuple[int, str]:
     """Check Go file with gofmt, go vet, and golangci-lint. Returns (0, reason)."""
     if file_path.name.endswith("_test.go"):
         return 0, ""
 
-    length_warning = check_file_length(file_path)
+    length_warning = check_file_length(file_path, st)
 
-    go_bin = shutil.which("go")
-    gofmt_bin = shutil.which("gofmt")
-    golangci_lint_bin = shutil.which("golangci-lint")
+    go_bin = cached_which("go")
+    gofmt_bin = cached_which("gofmt")
+    golangci_lint_bin = cached_which("golangci-lint")
 
     if not go_bin:
         return 0, length_warning
 
     if gofmt_bin:
         try:
-            subprocess.run([gofmt_bin, "-w", str(file_path)], capture_output=True, check=False)
+            subprocess.run([gofmt_bin, "-w", str(file_path)], capture_output=True, check=False, close_fds=False)
         except Exception:
             pass
 
     results: dict[str, tuple] = {}
-    has_issues = False
 
-    try:
-        result = subprocess.run([go_bin, "vet", str(file_path)], capture_output=True, text=True, check=False)
-        output = result.stdout + result.stderr
-        if result.returncode != 0 or output.strip():
-            lines = [line.strip() for line in output.splitlines() if line.strip() and not line.strip().startswith("#")]
-            if lines:
-                has_issues = True
-                results["vet"] = (len(lines), lines)
-    except Exception:
-        pass
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        vet_future = pool.submit(_run_vet, go_bin, file_path)
+        lint_future = pool.submit(_run_golangci_lint, golangci_lint_bin, file_path) if golangci_lint_bin else None
+        vet_result = vet_future.result()
+        lint_result = lint_future.result() if lint_future else None
 
-    if golangci_lint_bin:
-        try:
-            result = subprocess.run(
-                [golangci_lint_bin, "run", "--fast", str(file_path)], capture_output=True, text=True, check=False
-            )
-            output = result.stdout + result.stderr
-            if result.returncode != 0:
-                lines = [line.strip() for line in output.splitlines() if line.strip()]
-                issue_count = len([line for line in lines if ": " in line])
-                if issue_count > 0:
-                    has_issues = True
-                    results["lint"] = (issue_count, lines)
-        except Exception:
-            pass
+    if vet_result:
+        results["vet"] = vet_result
+    if lint_result:
+        results["lint"] = lint_result
 
-    if has_issues:
+    if results:
         parts = []
-        for tool_name, (count, _) in results.items():
+        for tool_name, (count, _, _) in results.items():
             parts.append(f"{count} {tool_name}")
         reason = f"Go: {', '.join(parts)} in {file_path.name}"
         details = _format_go_issues(file_path, results)
@@ -73,6 +61,62 @@ def check_go(file_path: Path) -> tuple[int, str]:
     return 0, length_warning
 
 
+def _scan_output(
+    cmd: list[str], keep: Callable[[bytes], bool], count: Callable[[bytes], bool]
+) -> tuple[int, int, list[str], int]:
+    """Stream a linter's combined stdout/stderr line by line.
+
+    Returns (returncode, matching_count, first_lines, kept_total), holding at
+    most MAX_SHOWN_LINES lines in memory no matter how long the output is.
+    Output is filtered as bytes; only the shown lines are decoded.
+    """
+    shown: list[str] = []
+    matching = 0
+    kept = 0
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, close_fds=False) as proc:
+        for raw in proc.stdout or ():
+            line = raw.strip()
+            if not keep(line):
+                continue
+            kept += 1
+            if count(line):
+                matching += 1
+            if len(shown) < MAX_SHOWN_LINES:
+                shown.append(line.decode("utf-8", "replace"))
+        returncode = proc.wait()
+    return returncode, matching, shown, kept
+
+
+def _run_vet(go_bin: str, file_path: Path) -> tuple[int, list[str], int] | None:
+    """Run go vet and return (issue_count, shown_lines, total_lines), or None when clean."""
+    try:
+        _, count, shown, total = _scan_output(
+            [go_bin, "vet", str(file_path)],
+            keep=lambda line: bool(line) and not line.startswith(b"#"),
+            count=lambda _line: True,
+        )
+        if count:
+            return count, shown, total
+    except Exception:
+        pass
+    return None
+
+
+def _run_golangci_lint(golangci_lint_bin: str, file_path: Path) -> tuple[int, list[str], int] | None:
+    """Run golangci-lint and return (issue_count, shown_lines, total_lines), or None when clean."""
+    try:
+        returncode, count, shown, total = _scan_output(
+            [golangci_lint_bin, "run", "--fast", str(file_path)],
+            keep=bool,
+            count=lambda line: b": " in line,
+        )
+        if returncode != 0 and count > 0:
+            return count, shown, total
+    except Exception:
+        pass
+    return None
+
+
 def _format_go_issues(file_path: Path, results: dict[str, tuple]) -> str:
     """Format Go diagnostic issues as plain text."""
     out: list[str] = []
@@ -83,22 +127,20 @@ def _format_go_issues(file_path: Path, results: dict[str, tuple]) -> str:
     out.append(f"Go Issues found in: {display_path}")
 
     if "vet" in results:
-        count, lines = results["vet"]
+        count, lines, _ = results["vet"]
         plural = "issue" if count == 1 else "issues"
         out.append(f"go vet: {count} {plural}")
-        for line in lines[:10]:
-            out.append(f"  {line}")
-        if count > 10:
-            out.append(f"  ... and {count - 10} more issues")
+        out.extend(f"  {line}" for line in lines[:MAX_SHOWN_LINES])
+        if count > MAX_SHOWN_LINES:
+            out.append(f"  ... and {count - MAX_SHOWN_LINES} more issues")
 
     if "lint" in results:
-        count, lines = results["lint"]
+        count, lines, total = results["lint"]
         plural = "issue" if count == 1 else "issues"
         out.append(f"golangci-lint: {count} {plural}")
-        for line in lines[:10]:
-            out.append(f"  {line}")
-        if len(lines) > 10:
-            out.append(f"  ... and {len(lines) - 10} more lines")
+        out.extend(f"  {line}" for line in lines[:MAX_SHOWN_LINES])
+        if total > MAX_SHOWN_LINES:
+            out.append(f"  ... and {total - MAX_SHOWN_LINES} more lines")
 
     out.append("Fix Go issues above before continuing")
     return "\n".join(out)
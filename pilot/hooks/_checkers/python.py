@@ -2,28 +2,31 @@
 
 from __future__ import annotations
 
-import re
-import shutil
+import os
 import subprocess
 from pathlib import Path
 
-from _util import check_file_length
+from _fastjson import loads
+from _util import cached_which, check_file_length
 
 
-def check_python(file_path: Path) -> tuple[int, str]:
+def check_python(file_path: Path, st: os.stat_result | None = None) -> tuple[int, str]:
     """Check Python file with ruff. Returns (0, reason)."""
     if "test_" in file_path.name or "spec" in file_path.name:
         return 0, ""
 
-    length_warning = check_file_length(file_path)
+    length_warning = check_file_length(file_path, st)
 
-    ruff_bin = shutil.which("ruff")
+    ruff_bin = cached_which("ruff")
     if ruff_bin:
         try:
             subprocess.run(
-                [ruff_bin, "check", "--select", "I,RUF022", "--fix", str(file_path)], capture_output=True, check=False
+                [ruff_bin, "check", "--select", "I,RUF022", "--fix", str(file_path)],
+                capture_output=True,
+                check=False,
+                close_fds=False,
             )
-            subprocess.run([ruff_bin, "format", str(file_path)], capture_output=True, check=False)
+            subprocess.run([ruff_bin, "format", str(file_path)], capture_output=True, check=False, close_fds=False)
         except Exception:
             pass
 
@@ -35,17 +38,15 @@ def check_python(file_path: Path) -> tuple[int, str]:
 
     try:
         result = subprocess.run(
-            [ruff_bin, "check", "--output-format=concise", str(file_path)],
+            [ruff_bin, "check", "--output-format=json", str(file_path)],
             capture_output=True,
-            text=True,
             check=False,
+            close_fds=False,
         )
-        output = result.stdout + result.stderr
-        error_pattern = re.compile(r":\d+:\d+: [A-Z]{1,3}\d+")
-        error_lines = [line for line in output.splitlines() if error_pattern.search(line)]
-        if error_lines:
+        diagnostics = loads(result.stdout) if result.stdout.strip() else []
+        if diagnostics:
             has_issues = True
-            results["ruff"] = (len(error_lines), error_lines)
+            results["ruff"] = (len(diagnostics), diagnostics)
     except Exception:
         pass
 
@@ -74,16 +75,15 @@ def _format_python_issues(file_path: Path, results: dict[str, tuple]) -> str:
     lines.append(f"Python Issues found in: {display_path}")
 
     if "ruff" in results:
-        count, error_lines = results["ruff"]
+        count, diagnostics = results["ruff"]
         plural = "issue" if count == 1 else "issues"
         lines.append(f"Ruff: {count} {plural}")
-        for line in error_lines:
-            parts = line.split(None, 1)
-            if parts:
-                code = parts[0]
-                msg = parts[1] if len(parts) > 1 else ""
-                msg = msg.replace("[*] ", "")
-                lines.append(f"  {code}: {msg}")
+        for diagnostic in diagnostics:
+            file_name = Path(diagnostic.get("filename", "")).name
+            row = diagnostic.get("location", {}).get("row", 0)
+            code = diagnostic.get("code") or "syntax"
+            message = diagnostic.get("message", "")
+            lines.append(f"  {file_name}:{row} {code}: {message}")
 
     lines.append("Fix Python issues above before continuing")
     return "\n".join(lines)
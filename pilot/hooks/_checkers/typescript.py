@@ -2,18 +2,20 @@
 
 from __future__ import annotations
 
-import json
+import functools
 import os
-import shutil
+import re
 import subprocess
 import sys
 from pathlib import Path
 
-from _util import BLUE, NC, check_file_length
+from _fastjson import loads
+from _util import BLUE, NC, cached_which, check_file_length
 
-TS_EXTENSIONS = {".ts", ".tsx", ".js", ".jsx", ".mjs", ".mts"}
 DEBUG = os.environ.get("HOOK_DEBUG", "").lower() == "true"
 
+_TEST_FILE_RE = re.compile(r"\.(?:test|spec)\.")
+
 
 def debug_log(message: str) -> None:
     """Print debug message if enabled."""
@@ -23,33 +25,37 @@ def debug_log(message: str) -> None:
 
 def find_project_root(file_path: Path) -> Path | None:
     """Find nearest directory with package.json."""
-    current = file_path.parent
-    depth = 0
-    while current != current.parent:
-        if (current / "package.json").exists():
-            return current
-        current = current.parent
-        depth += 1
-        if depth > 20:
+    current = os.path.dirname(os.path.abspath(file_path))
+    for _ in range(21):
+        parent = os.path.dirname(current)
+        if parent == current:
             break
+        if os.path.isfile(os.path.join(current, "package.json")):
+            return Path(current)
+        current = parent
     return None
 
 
+@functools.cache
 def find_tool(tool_name: str, project_root: Path | None) -> str | None:
     """Find tool binary, preferring local node_modules."""
     if project_root:
         local_bin = project_root / "node_modules" / ".bin" / tool_name
         if local_bin.exists():
             return str(local_bin)
-    return shutil.which(tool_name)
+    return cached_which(tool_name)
+
 
+def check_typescript(file_path: Path, st: os.stat_result | None = None) -> tuple[int, str]:
+    """Check TypeScript file with prettier and eslint. Returns (0, reason).
 
-def check_typescript(file_path: Path) -> tuple[int, str]:
-    """Check TypeScript file with prettier and eslint. Returns (0, reason)."""
-    if ".test." in file_path.name or ".spec." in file_path.name:
+    Prefers eslint_d when installed: it keeps ESLint loaded in a background
+    daemon, so repeated edits skip Node startup and config resolution.
+    """
+    if _TEST_FILE_RE.search(file_path.name):
         return 0, ""
 
-    length_warning = check_file_length(file_path)
+    length_warning = check_file_length(file_path, st)
 
     project_root = find_project_root(file_path)
 
@@ -57,12 +63,16 @@ def check_typescript(file_path: Path) -> tuple[int, str]:
     if prettier_bin:
         try:
             subprocess.run(
-                [prettier_bin, "--write", str(file_path)], capture_output=True, check=False, cwd=project_root
+                [prettier_bin, "--write", str(file_path)],
+                capture_output=True,
+                check=False,
+                close_fds=False,
+                cwd=project_root,
             )
         except Exception:
             pass
 
-    eslint_bin = find_tool("eslint", project_root)
+    eslint_bin = find_tool("eslint_d", project_root) or find_tool("eslint", project_root)
 
     if not eslint_bin:
         return 0, length_warning
@@ -101,18 +111,18 @@ def _run_eslint(
         result = subprocess.run(
             [eslint_bin, "--format", "json", str(file_path)],
             capture_output=True,
-            text=True,
             check=False,
+            close_fds=False,
             cwd=project_root,
         )
         try:
-            data = json.loads(result.stdout)
+            data = loads(result.stdout)
             total_errors = sum(f.get("errorCount", 0) for f in data)
             total_warnings = sum(f.get("warningCount", 0) for f in data)
             if total_errors > 0 or total_warnings > 0:
                 has_issues = True
                 results["eslint"] = (total_errors, total_warnings, data)
-        except json.JSONDecodeError:
+        except ValueError:
             pass
     except Exception:
         pass
@@ -134,16 +144,17 @@ def _format_typescript_issues(file_path: Path, results: dict[str, tuple]) -> str
         plural = "issue" if total == 1 else "issues"
         lines.append(f"ESLint: {total} {plural} ({total_errors} errors, {total_warnings} warnings)")
         for file_result in data:
+            messages = file_result.get("messages", [])
+            if not messages:
+                continue
             file_name = Path(file_result.get("filePath", "")).name
-            for msg in file_result.get("messages", [])[:10]:
-                line_num = msg.get("line", 0)
-                rule_id = msg.get("ruleId", "unknown")
-                message = msg.get("message", "")
+            for msg in messages[:10]:
                 severity = "error" if msg.get("severity", 0) == 2 else "warn"
-                lines.append(f"  {file_name}:{line_num} [{severity}] {rule_id}: {message}")
-            if len(file_result.get("messages", [])) > 10:
-                remaining = len(file_result["messages"]) - 10
-                lines.append(f"  ... and {remaining} more issues")
+                lines.append(
+                    f"  {file_name}:{msg.get('line', 0)} [{severity}] {msg.get('ruleId', 'unknown')}: {msg.get('message', '')}"
+                )
+            if len(messages) > 10:
+                lines.append(f"  ... and {len(messages) - 10} more issues")
 
     lines.append("Fix TypeScript issues above before continuing")
     return "\n".join(lines)
@@ -5,10 +5,27 @@ Fire-and-forget — silently ignores all errors.
 
 from __future__ import annotations
 
-import json
-import urllib.request
+from _fastjson import dumps
 
-CONSOLE_URL = "http://localhost:41777"
+CONSOLE_HOST = "localhost"
+CONSOLE_PORT = 41777
+CONSOLE_URL = f"http://{CONSOLE_HOST}:{CONSOLE_PORT}"
+NOTIFICATIONS_PATH = "/api/notifications"
+_HEADERS = {"Content-Type": "application/json"}
+
+
+def _post(body: bytes) -> bool:
+    """POST body on a fresh connection, returning True on a 201 response."""
+    import http.client
+
+    conn = http.client.HTTPConnection(CONSOLE_HOST, CONSOLE_PORT, timeout=3)
+    try:
+        conn.request("POST", NOTIFICATIONS_PATH, body=body, headers=_HEADERS)
+        return conn.getresponse().status == 201
+    except Exception:
+        return False
+    finally:
+        conn.close()
 
 
 def send_dashboard_notification(
@@ -18,15 +35,9 @@ def send_dashboard_notification(
     plan_path: str | None = None,
 ) -> bool:
     """POST a notification to the Console API. Returns True on success."""
-    url = f"{CONSOLE_URL}/api/notifications"
-    payload: dict[str, str] = {"type": type, "title": title, "message": message}
+    # Splice each encoded string into fixed key fragments rather than encoding a dict.
+    body = b'{"type":' + dumps(type) + b',"title":' + dumps(title) + b',"message":' + dumps(message)
     if plan_path:
-        payload["planPath"] = plan_path
-
-    data = json.dumps(payload).encode()
-    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"}, method="POST")
-    try:
-        resp = urllib.request.urlopen(req, timeout=3)
-        return resp.status == 201
-    except Exception:
-        return False
+        body += b',"planPath":' + dumps(plan_path)
+    body += b"}"
+    return _post(body)
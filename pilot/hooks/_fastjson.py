@@ -0,0 +1,21 @@
+"""JSON for hot hook paths — orjson when installed, stdlib otherwise.
+
+Both backends raise a ``json.JSONDecodeError`` subclass on bad input, so
+callers keep catching ``json.JSONDecodeError``. ``dumps`` always returns
+compact UTF-8 bytes, ready to send or write without another encode.
+"""
+
+from __future__ import annotations
+
+try:
+    from orjson import dumps, loads
+except ImportError:
+    import json
+    from json import loads
+
+    def dumps(obj: object) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+__all__ = ["dumps", "loads"]
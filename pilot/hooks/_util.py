@@ -1,17 +1,22 @@
 """Shared utilities for hook scripts.
 
 This module provides common constants, color codes, session path helpers,
-and utility functions used across all hook scripts.
+and utility functions used across all hook scripts. Modules only some hooks
+need (subprocess, shutil, select) are imported inside the helpers that use
+them to keep hook start-up cheap.
 """
 
 from __future__ import annotations
 
+import functools
 import json
 import os
-import subprocess
 import sys
+from collections.abc import Iterator
 from pathlib import Path
 
+from _fastjson import loads
+
 RED = "\033[0;31m"
 YELLOW = "\033[0;33m"
 GREEN = "\033[0;32m"
@@ -34,7 +39,7 @@ def _read_model_from_config() -> str:
     """
     try:
         config_path = Path.home() / ".pilot" / "config.json"
-        data = json.loads(config_path.read_text())
+        data = json.loads(config_path.read_bytes())
         model = data.get("model", "sonnet")
         if isinstance(model, str) and model in ("sonnet", "sonnet[1m]", "opus", "opus[1m]"):
             return model
@@ -43,15 +48,22 @@ def _read_model_from_config() -> str:
     return "sonnet"
 
 
+_COMPACTION_THRESHOLDS_PCT = {
+    window: (window - _AUTOCOMPACT_BUFFER_TOKENS) / window * 100 for window in (200_000, 1_000_000)
+}
+
+
+@functools.cache
 def _get_max_context_tokens() -> int:
     """Return context window size for the user's configured model.
 
-    Returns 1_000_000 for 1M variants, 200_000 otherwise.
+    Returns 1_000_000 for 1M variants, 200_000 otherwise. Resolved once per process.
     """
     model = _read_model_from_config()
     return 1_000_000 if "[1m]" in model else 200_000
 
 
+@functools.cache
 def _get_compaction_threshold_pct() -> float:
     """Return compaction threshold as percentage of total context window.
 
@@ -59,8 +71,7 @@ def _get_compaction_threshold_pct() -> float:
     - 200K context: 83.5%
     - 1M context:  96.7%
     """
-    window = _get_max_context_tokens()
-    return (window - _AUTOCOMPACT_BUFFER_TOKENS) / window * 100
+    return _COMPACTION_THRESHOLDS_PCT[_get_max_context_tokens()]
 
 
 def _sessions_base() -> Path:
@@ -68,34 +79,77 @@ def _sessions_base() -> Path:
     return Path.home() / ".pilot" / "sessions"
 
 
+@functools.cache
+def _session_id() -> str:
+    """Get the current Pilot session ID, falling back to 'default'.
+
+    The launcher sets PILOT_SESSION_ID before the hook starts, so it is read once per process.
+    """
+    return os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
+
+
+@functools.cache
+def _session_dir(session_id: str) -> Path:
+    """Get a session's state directory, creating it once per process."""
+    session_dir = _sessions_base() / session_id
+    session_dir.mkdir(parents=True, exist_ok=True)
+    return session_dir
+
+
 def get_session_cache_path() -> Path:
     """Get session-scoped context cache path."""
-    session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
-    cache_dir = _sessions_base() / session_id
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir / "context-cache.json"
+    return _session_dir(_session_id()) / "context-cache.json"
+
+
+def get_session_lint_cache_path() -> Path:
+    """Get session-scoped lint result cache path."""
+    return _session_dir(_session_id()) / "lint-cache.json"
 
 
 def get_session_plan_path() -> Path:
     """Get session-scoped active plan JSON path."""
-    session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
-    return _sessions_base() / session_id / "active_plan.json"
+    return _sessions_base() / _session_id() / "active_plan.json"
+
+
+@functools.cache
+def cached_which(name: str) -> str | None:
+    """Memoized shutil.which — the toolchain on PATH doesn't change mid-run."""
+    import shutil
+
+    return shutil.which(name)
 
 
 def find_git_root() -> Path | None:
     """Find git repository root."""
+    import subprocess
+
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--show-toplevel"],
             capture_output=True,
             text=True,
             check=False,
+            close_fds=False,
         )
-        if result.returncode == 0:
-            return Path(result.stdout.strip())
     except Exception:
-        pass
-    return None
+        return None
+    return Path(result.stdout.strip()) if result.returncode == 0 else None
+
+
+@functools.cache
+def _stdin_payload() -> dict:
+    """Parse the hook JSON on stdin once; later readers share the parsed dict.
+
+    The raw bytes under sys.stdin are parsed directly, skipping the text
+    decoder; a stdin without a byte buffer (e.g. StringIO) is read as text.
+    """
+    stdin = sys.stdin
+    try:
+        raw = stdin.buffer.read() if hasattr(stdin, "buffer") else stdin.read()
+        data = loads(raw) if raw else {}
+    except (ValueError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
 
 
 def read_hook_stdin() -> dict:
@@ -103,13 +157,7 @@ def read_hook_stdin() -> dict:
 
     Returns empty dict on error or invalid JSON.
     """
-    try:
-        content = sys.stdin.read()
-        if not content:
-            return {}
-        return json.loads(content)
-    except (json.JSONDecodeError, OSError):
-        return {}
+    return _stdin_payload()
 
 
 def get_edited_file_from_stdin() -> Path | None:
@@ -118,7 +166,7 @@ def get_edited_file_from_stdin() -> Path | None:
         import select
 
         if select.select([sys.stdin], [], [], 0)[0]:
-            data = json.load(sys.stdin)
+            data = _stdin_payload()
             tool_input = data.get("tool_input", {})
             file_path = tool_input.get("file_path")
             if file_path:
@@ -128,53 +176,114 @@ def get_edited_file_from_stdin() -> Path | None:
     return None
 
 
+_TRANSCRIPT_CHUNK_BYTES = 64 * 1024
+
+
+def _iter_lines_reversed(fd: int) -> Iterator[bytes]:
+    """Yield the lines of an open file last to first.
+
+    Each chunk is fetched with one positional os.pread, so walking back through
+    the file needs no seeks and no buffered or text-mode wrapper.
+    """
+    pos = os.fstat(fd).st_size
+    head = b""
+    while pos > 0:
+        step = min(_TRANSCRIPT_CHUNK_BYTES, pos)
+        pos -= step
+        lines = (os.pread(fd, step, pos) + head).split(b"\n")
+        head = lines.pop(0)
+        yield from reversed(lines)
+    yield head
+
+
+def _last_assistant_message(transcript_path: str) -> dict | None:
+    """Return the last assistant message in a JSONL transcript, or None.
+
+    The transcript is scanned from the end and a line is parsed only when it
+    can be an assistant message. Raises OSError if the file can't be read.
+    """
+    fd = os.open(transcript_path, os.O_RDONLY)
+    try:
+        for line in _iter_lines_reversed(fd):
+            if b'"assistant"' not in line:
+                continue
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(msg, dict) and msg.get("type") == "assistant":
+                return msg
+    finally:
+        os.close(fd)
+    return None
+
+
 def is_waiting_for_user_input(transcript_path: str) -> bool:
     """Check if Claude's last action was asking the user a question."""
     try:
-        transcript = Path(transcript_path)
-        if not transcript.exists():
-            return False
-
-        last_assistant_msg = None
-        with transcript.open() as f:
-            for line in f:
-                try:
-                    msg = json.loads(line)
-                    if msg.get("type") == "assistant":
-                        last_assistant_msg = msg
-                except json.JSONDecodeError:
-                    continue
-
-        if not last_assistant_msg:
-            return False
-
-        message = last_assistant_msg.get("message", {})
-        if not isinstance(message, dict):
-            return False
-
-        content = message.get("content", [])
-        if not isinstance(content, list):
-            return False
-
-        for block in content:
-            if isinstance(block, dict) and block.get("type") == "tool_use":
-                if block.get("name") == "AskUserQuestion":
-                    return True
+        last_assistant_msg = _last_assistant_message(transcript_path)
+    except OSError:
+        return False
 
+    if not last_assistant_msg:
         return False
-    except OSError:
+
+    message = last_assistant_msg.get("message", {})
+    if not isinstance(message, dict):
         return False
 
+    content = message.get("content", [])
+    if not isinstance(content, list):
+        return False
+
+    for block in content:
+        if isinstance(block, dict) and block.get("type") == "tool_use":
+            if block.get("name") == "AskUserQuestion":
+                return True
+
+    return False
+
 
-def check_file_length(file_path: Path) -> str:
+_LINE_COUNT_CHUNK_BYTES = 1 << 20
+
+
+def _count_lines(fd: int) -> int:
+    """Count lines in an open file, reading fixed-size chunks so memory stays bounded."""
+    line_count = 0
+    last_chunk = b""
+    while chunk := os.read(fd, _LINE_COUNT_CHUNK_BYTES):
+        line_count += chunk.count(b"\n")
+        last_chunk = chunk
+    if last_chunk and not last_chunk.endswith(b"\n"):
+        line_count += 1
+    return line_count
+
+
+def check_file_length(file_path: Path, st: os.stat_result | None = None) -> str:
     """Check if file exceeds length thresholds.
 
+    A file no larger than FILE_LENGTH_WARN bytes cannot have more lines than
+    that, so it is accepted from its size alone without being read. Pass a
+    stat result the caller already has to skip the extra stat. Lines are
+    counted as newline bytes in raw chunks, with no text decoding.
+
     Returns a plain-text warning message or empty string if OK.
     """
+    if st is not None and st.st_size <= FILE_LENGTH_WARN:
+        return ""
     try:
-        line_count = len(file_path.read_text().splitlines())
-    except Exception:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return ""
+    try:
+        size = st.st_size if st is not None else os.fstat(fd).st_size
+        if size <= FILE_LENGTH_WARN:
+            return ""
+        line_count = _count_lines(fd)
+    except OSError:
         return ""
+    finally:
+        os.close(fd)
 
     if line_count > FILE_LENGTH_CRITICAL:
         return (
@@ -189,40 +298,35 @@ def check_file_length(file_path: Path) -> str:
     return ""
 
 
+# Hook responses have a fixed shape around one varying string, so the helpers
+# below splice json.dumps(<string>) into a constant prefix. The output is
+# identical to json.dumps of the full dict.
+_BLOCK_PREFIX = '{"decision": "block", "reason": '
+_DENY_PREFIX = '{"permissionDecision": "deny", "reason": '
+_POST_TOOL_USE_CONTEXT_PREFIX = '{"hookSpecificOutput": {"hookEventName": "PostToolUse", "additionalContext": '
+_PRE_TOOL_USE_CONTEXT_PREFIX = '{"hookSpecificOutput": {"hookEventName": "PreToolUse", "additionalContext": '
+
+
 def post_tool_use_block(reason: str) -> str:
     """Build PostToolUse block JSON (drops tool result, shows reason to Claude)."""
-    return json.dumps({"decision": "block", "reason": reason})
+    return _BLOCK_PREFIX + json.dumps(reason) + "}"
 
 
 def post_tool_use_context(context: str) -> str:
     """Build PostToolUse additionalContext JSON (adds context without blocking)."""
-    return json.dumps(
-        {
-            "hookSpecificOutput": {
-                "hookEventName": "PostToolUse",
-                "additionalContext": context,
-            }
-        }
-    )
+    return _POST_TOOL_USE_CONTEXT_PREFIX + json.dumps(context) + "}}"
 
 
 def pre_tool_use_deny(reason: str) -> str:
     """Build PreToolUse deny JSON (blocks tool call)."""
-    return json.dumps({"permissionDecision": "deny", "reason": reason})
+    return _DENY_PREFIX + json.dumps(reason) + "}"
 
 
 def pre_tool_use_context(context: str) -> str:
     """Build PreToolUse additionalContext JSON (hint without blocking)."""
-    return json.dumps(
-        {
-            "hookSpecificOutput": {
-                "hookEventName": "PreToolUse",
-                "additionalContext": context,
-            }
-        }
-    )
+    return _PRE_TOOL_USE_CONTEXT_PREFIX + json.dumps(context) + "}}"
 
 
 def stop_block(reason: str) -> str:
     """Build Stop block JSON (prevents session stop)."""
-    return json.dumps({"decision": "block", "reason": reason})
+    return _BLOCK_PREFIX + json.dumps(reason) + "}"
@@ -10,6 +10,7 @@ import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
+from _fastjson import dumps, loads
 from _util import (
     _get_compaction_threshold_pct,
     _get_max_context_tokens,
@@ -34,14 +35,12 @@ def _get_pilot_session_id() -> str:
 
 def get_session_flags(session_id: str) -> tuple[list[int], bool]:
     """Get shown flags for this session (learn thresholds, warn-once flag)."""
-    if get_session_cache_path().exists():
-        try:
-            with get_session_cache_path().open() as f:
-                cache = json.load(f)
-                if cache.get("session_id") == session_id:
-                    return cache.get("shown_learn", []), cache.get("shown_80_warn", False)
-        except (json.JSONDecodeError, OSError):
-            pass
+    try:
+        cache = loads(get_session_cache_path().read_bytes())
+        if cache.get("session_id") == session_id:
+            return cache.get("shown_learn", []), cache.get("shown_80_warn", False)
+    except (json.JSONDecodeError, OSError):
+        pass
     return [], False
 
 
@@ -51,15 +50,13 @@ def save_cache(
     """Save context calculation to cache with session ID."""
     existing_shown: list[int] = []
     existing_80_warn = False
-    if get_session_cache_path().exists():
-        try:
-            with get_session_cache_path().open() as f:
-                cache = json.load(f)
-                if cache.get("session_id") == session_id:
-                    existing_shown = cache.get("shown_learn", [])
-                    existing_80_warn = cache.get("shown_80_warn", False)
-        except (json.JSONDecodeError, OSError):
-            pass
+    try:
+        cache = loads(get_session_cache_path().read_bytes())
+        if cache.get("session_id") == session_id:
+            existing_shown = cache.get("shown_learn", [])
+            existing_80_warn = cache.get("shown_80_warn", False)
+    except (json.JSONDecodeError, OSError):
+        pass
 
     if shown_learn:
         existing_shown = list(set(existing_shown + shown_learn))
@@ -67,17 +64,17 @@ def save_cache(
         existing_80_warn = True
 
     try:
-        with get_session_cache_path().open("w") as f:
-            json.dump(
+        get_session_cache_path().write_bytes(
+            dumps(
                 {
                     "tokens": tokens,
                     "timestamp": time.time(),
                     "session_id": session_id,
                     "shown_learn": existing_shown,
                     "shown_80_warn": existing_80_warn,
-                },
-                f,
+                }
             )
+        )
     except OSError:
         pass
 
@@ -92,10 +89,8 @@ def _read_statusline_context_pct() -> float | None:
     if not pilot_session_id:
         return None
     cache_file = Path.home() / ".pilot" / "sessions" / pilot_session_id / "context-pct.json"
-    if not cache_file.exists():
-        return None
     try:
-        data = json.loads(cache_file.read_text())
+        data = loads(cache_file.read_bytes())
         ts = data.get("ts")
         if ts is None or time.time() - ts > 60:
             return None
@@ -113,14 +108,19 @@ def _is_throttled(session_id: str) -> bool:
     - Last cached context was below the warning threshold (~80% effective)
 
     Always returns False at high context (never throttle when approaching compaction).
+    The cache's timestamp is written with the file, so a file last modified 30+
+    seconds ago is already known to be stale and is never opened.
     """
     cache_path = get_session_cache_path()
-    if not cache_path.exists():
+    try:
+        if time.time() - os.stat(cache_path).st_mtime >= 30:
+            return False
+    except OSError:
         return False
 
     try:
-        with cache_path.open() as f:
-            cache = json.load(f)
+        with cache_path.open("rb") as f:
+            cache = loads(f.read())
             if cache.get("session_id") != session_id:
                 return False
 
@@ -7,16 +7,17 @@ Warnings are non-blocking — they inform but never prevent edits.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _checkers.go import check_go
-from _checkers.python import check_python
-from _checkers.typescript import TS_EXTENSIONS, check_typescript
-from _util import find_git_root, post_tool_use_context
+import _checkers
+from _checkers import TS_EXTENSIONS
+from _fastjson import dumps, loads
+from _util import find_git_root, get_session_lint_cache_path, post_tool_use_context
 from tdd_enforcer import (
     has_go_test_file,
     has_python_test_file,
@@ -27,9 +28,33 @@ from tdd_enforcer import (
     should_skip,
 )
 
+CHECKERS_BY_SUFFIX = {".py": "check_python", ".go": "check_go", **dict.fromkeys(TS_EXTENSIONS, "check_typescript")}
+CHECKED_SUFFIXES = CHECKERS_BY_SUFFIX.keys()
+LINT_CACHE_MAX_ENTRIES = 200
 
-def _tdd_check(tool_name: str, tool_input: dict, file_path: str) -> str:
-    """Run TDD enforcement, return warning message or empty string."""
+
+def _is_unchanged_replacement(edit: dict) -> bool:
+    """Check if a single old_string/new_string replacement is an identity."""
+    old_string = edit.get("old_string")
+    return isinstance(old_string, str) and old_string == edit.get("new_string")
+
+
+def _is_noop_edit(tool_name: str, tool_input: dict) -> bool:
+    """Check if an Edit/MultiEdit left the file text unchanged."""
+    if tool_name == "Edit":
+        return _is_unchanged_replacement(tool_input)
+    if tool_name == "MultiEdit":
+        edits = tool_input.get("edits") or []
+        return bool(edits) and all(_is_unchanged_replacement(e) for e in edits)
+    return False
+
+
+def _tdd_check(tool_name: str, tool_input: dict, file_path: str, git_root: Path | None = None) -> str:
+    """Run TDD enforcement, return warning message or empty string.
+
+    The search for a pytest lastfailed cache walks up from the file and stops
+    at git_root, since caches outside the repository never belong to it.
+    """
     if should_skip(file_path) or is_test_file(file_path):
         return ""
     if is_trivial_edit(tool_name, tool_input):
@@ -40,7 +65,7 @@ def _tdd_check(tool_name: str, tool_input: dict, file_path: str) -> str:
         for _ in range(10):
             if has_related_failing_test(str(path), file_path):
                 return ""
-            if path.parent == path:
+            if path == git_root or path.parent == path:
                 break
             path = path.parent
         if has_python_test_file(file_path):
@@ -63,36 +88,96 @@ def _tdd_check(tool_name: str, tool_input: dict, file_path: str) -> str:
     return ""
 
 
-def main() -> int:
-    """Single entry point — file quality + TDD in one pass."""
+def _run_file_checker(target_file: Path, st: os.stat_result | None = None) -> str:
+    """Dispatch to the language checker for the file's suffix, importing only that checker."""
+    checker_name = CHECKERS_BY_SUFFIX.get(target_file.suffix)
+    if checker_name is None:
+        return ""
+    return getattr(_checkers, checker_name)(target_file, st)[1]
+
+
+def _load_lint_cache(cache_path: Path) -> dict:
+    """Load the session lint cache, returning an empty dict when missing or corrupt."""
     try:
-        hook_data = json.load(sys.stdin)
+        data = loads(cache_path.read_bytes())
+        return data if isinstance(data, dict) else {}
     except (json.JSONDecodeError, OSError):
-        return 0
+        return {}
+
+
+def _content_digest(target_file: Path) -> str:
+    """Hash the file's bytes; identical content yields the same digest whatever its mtime."""
+    return hashlib.blake2b(target_file.read_bytes(), digest_size=16).hexdigest()
+
+
+def _cached_file_check(target_file: Path, cache_key: str, st: os.stat_result) -> str:
+    """Run the language checker unless the file's content matches its last check.
+
+    Entries are keyed by absolute path and stamped with a digest of the content
+    left after the checker ran, so formatter rewrites don't invalidate the entry
+    and a Write that reproduces already-checked content reuses its result.
+    The cache is per session, so linter config edits take effect in the next one.
+    Only the LINT_CACHE_MAX_ENTRIES most recently checked files are kept.
+    """
+    if target_file.suffix not in CHECKED_SUFFIXES:
+        return ""
+
+    try:
+        cache_path = get_session_lint_cache_path()
+        digest = _content_digest(target_file)
+    except OSError:
+        return _run_file_checker(target_file, st)
+
+    cache = _load_lint_cache(cache_path)
+    entry = cache.get(cache_key)
+    if isinstance(entry, list) and len(entry) == 2 and entry[0] == digest:
+        return entry[1]
+
+    reason = _run_file_checker(target_file, st)
+
+    try:
+        cache.pop(cache_key, None)
+        cache[cache_key] = [_content_digest(target_file), reason]
+        for stale_key in list(cache)[:-LINT_CACHE_MAX_ENTRIES]:
+            del cache[stale_key]
+        cache_path.write_bytes(dumps(cache))
+    except OSError:
+        pass
+    return reason
+
+
+def main(hook_data: dict | None = None) -> int:
+    """Single entry point — file quality + TDD in one pass.
+
+    hook_data is the parsed hook JSON; when omitted it is read from stdin.
+    """
+    if hook_data is None:
+        try:
+            hook_data = loads(sys.stdin.read())
+        except (json.JSONDecodeError, OSError):
+            return 0
 
     tool_name = hook_data.get("tool_name", "")
     tool_input = hook_data.get("tool_input", {})
     file_path_str = tool_input.get("file_path", "")
     if not file_path_str:
         return 0
+    if _is_noop_edit(tool_name, tool_input):
+        return 0
 
-    target_file = Path(file_path_str)
-    if not target_file.exists():
+    try:
+        st = os.stat(file_path_str)
+    except OSError:
         return 0
+    target_file = Path(file_path_str)
+    cache_key = os.path.abspath(file_path_str)
 
     git_root = find_git_root()
     if git_root:
         os.chdir(git_root)
 
-    file_reason = ""
-    if target_file.suffix == ".py":
-        _, file_reason = check_python(target_file)
-    elif target_file.suffix in TS_EXTENSIONS:
-        _, file_reason = check_typescript(target_file)
-    elif target_file.suffix == ".go":
-        _, file_reason = check_go(target_file)
-
-    tdd_reason = _tdd_check(tool_name, tool_input, file_path_str)
+    file_reason = _cached_file_check(target_file, cache_key, st)
+    tdd_reason = _tdd_check(tool_name, tool_input, file_path_str, git_root)
 
     reasons = [r for r in (file_reason, tdd_reason) if r]
     if reasons:
@@ -15,22 +15,30 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
+from _fastjson import loads
 
 PILOT_BIN = Path.home() / ".pilot" / "bin" / "pilot"
+PLUGIN_ROOT = os.environ.get("CLAUDE_PLUGIN_ROOT", "")
 
 
 def _get_active_session_count() -> int:
-    """Get active session count from the pilot binary."""
+    """Get active session count from the pilot binary.
+
+    Skips the spawn entirely when the binary is not installed.
+    """
+    if not os.access(PILOT_BIN, os.X_OK):
+        return 0
     try:
         result = subprocess.run(
             [str(PILOT_BIN), "sessions", "--json"],
             capture_output=True,
             text=True,
             check=False,
+            close_fds=False,
             timeout=10,
         )
         if result.returncode == 0:
-            data = json.loads(result.stdout)
+            data = loads(result.stdout)
             return data.get("count", 0)
     except (json.JSONDecodeError, OSError, subprocess.TimeoutExpired):
         pass
@@ -38,21 +46,21 @@ def _get_active_session_count() -> int:
 
 
 def main() -> int:
-    plugin_root = os.environ.get("CLAUDE_PLUGIN_ROOT", "")
-    if not plugin_root:
+    if not PLUGIN_ROOT:
         return 0
 
     count = _get_active_session_count()
     if count > 1:
         return 0
 
-    stop_script = Path(plugin_root) / "scripts" / "worker-service.cjs"
+    stop_script = Path(PLUGIN_ROOT) / "scripts" / "worker-service.cjs"
     try:
         subprocess.run(
             ["bun", str(stop_script), "stop"],
             capture_output=True,
             text=True,
             check=False,
+            close_fds=False,
             timeout=15,
         )
     except subprocess.TimeoutExpired:
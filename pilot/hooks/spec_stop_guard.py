@@ -10,6 +10,7 @@ Only allows stopping when:
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 import re
@@ -18,27 +19,48 @@ import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
+from _fastjson import loads
 from _util import _sessions_base, get_session_plan_path, is_waiting_for_user_input, stop_block
 
 COOLDOWN_SECONDS = 60
 
+PLAN_HEADER_BYTES = 4096
+_STATUS_RE = re.compile(rb"^Status:\s*(\w+)", re.MULTILINE)
 
+
+@functools.cache
 def get_stop_guard_path() -> Path:
-    """Get session-scoped stop guard state path."""
+    """Get session-scoped stop guard state path (resolved and created once per process)."""
     session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
     guard_dir = _sessions_base() / session_id
     guard_dir.mkdir(parents=True, exist_ok=True)
     return guard_dir / "spec-stop-guard"
 
 
+def _read_state(state_file: Path) -> bytes:
+    """Read the stop guard timestamp (a few bytes) with a single read."""
+    fd = os.open(state_file, os.O_RDONLY)
+    try:
+        return os.read(fd, 64)
+    finally:
+        os.close(fd)
+
+
+def _write_state(state_file: Path, now: float) -> None:
+    """Overwrite the stop guard timestamp with a single write."""
+    fd = os.open(state_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, str(now).encode())
+    finally:
+        os.close(fd)
+
+
 def find_active_plan() -> tuple[Path | None, str | None]:
     """Find the active plan for THIS session via session-scoped active_plan.json."""
     plan_json = get_session_plan_path()
-    if not plan_json.exists():
-        return None, None
-
     try:
-        data = json.loads(plan_json.read_text())
+        with open(plan_json, "rb") as f:
+            data = loads(f.read())
         plan_path_str = data.get("plan_path", "")
     except (json.JSONDecodeError, OSError):
         return None, None
@@ -50,26 +72,26 @@ def find_active_plan() -> tuple[Path | None, str | None]:
     if not plan_file.is_absolute():
         project_root = os.environ.get("CLAUDE_PROJECT_ROOT", str(Path.cwd()))
         plan_file = Path(project_root) / plan_file
-    if not plan_file.exists():
-        return None, None
 
     try:
-        content = plan_file.read_text()
-        status_match = re.search(r"^Status:\s*(\w+)", content, re.MULTILINE)
-        if not status_match:
-            return None, None
-        status = status_match.group(1).upper()
-        if status not in ("PENDING", "COMPLETE"):
-            return None, None
-        return plan_file, status
+        with open(plan_file, "rb") as f:
+            head = f.read(PLAN_HEADER_BYTES)
     except OSError:
         return None, None
 
+    status_match = _STATUS_RE.search(head)
+    if not status_match:
+        return None, None
+    status = status_match.group(1).decode("ascii", "ignore").upper()
+    if status not in ("PENDING", "COMPLETE"):
+        return None, None
+    return plan_file, status
+
 
 def main() -> int:
     """Check if stopping is allowed based on /spec workflow state."""
     try:
-        input_data = json.load(sys.stdin)
+        input_data = loads(sys.stdin.read())
     except json.JSONDecodeError:
         return 0
 
@@ -86,17 +108,16 @@ def main() -> int:
 
     now = time.time()
     state_file = get_stop_guard_path()
-    if state_file.exists():
-        try:
-            last_block = float(state_file.read_text().strip())
-            if now - last_block < COOLDOWN_SECONDS:
-                state_file.unlink(missing_ok=True)
-                return 0
-        except (ValueError, OSError):
-            pass
+    try:
+        last_block = float(_read_state(state_file))
+        if now - last_block < COOLDOWN_SECONDS:
+            state_file.unlink(missing_ok=True)
+            return 0
+    except (ValueError, OSError):
+        pass
 
     try:
-        state_file.write_text(str(now))
+        _write_state(state_file, now)
     except OSError:
         pass
 
@@ -10,7 +10,16 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
-from _util import is_waiting_for_user_input, stop_block
+from _util import _sessions_base, is_waiting_for_user_input, stop_block
+
+
+def _read_active_plan(session_id: str) -> dict | None:
+    """Read the session's active_plan.json, or None if it is missing or invalid."""
+    try:
+        data = json.loads((_sessions_base() / session_id / "active_plan.json").read_bytes())
+    except (json.JSONDecodeError, OSError):
+        return None
+    return data if isinstance(data, dict) else None
 
 
 def main() -> int:
@@ -25,14 +34,13 @@ def main() -> int:
     if transcript_path and is_waiting_for_user_input(transcript_path):
         return 0
     session_id = os.environ.get("PILOT_SESSION_ID", "").strip() or "default"
-    plan_json = Path.home() / ".pilot" / "sessions" / session_id / "active_plan.json"
-    if not plan_json.exists():
+    data = _read_active_plan(session_id)
+    if data is None:
+        return 0
+    plan_path_str = data.get("plan_path", "")
+    if not plan_path_str:
         return 0
     try:
-        data = json.loads(plan_json.read_text())
-        plan_path_str = data.get("plan_path", "")
-        if not plan_path_str:
-            return 0
         plan_file = Path(plan_path_str)
         if not plan_file.is_absolute():
             plan_file = Path(os.environ.get("CLAUDE_PROJECT_ROOT", str(Path.cwd()))) / plan_file
@@ -40,7 +48,7 @@ def main() -> int:
             return 0
         status_match = re.search(r"^Status:\s*(\w+)", plan_file.read_text(), re.MULTILINE)
         status = status_match.group(1).upper() if status_match else None
-    except (json.JSONDecodeError, OSError):
+    except OSError:
         return 0
     if status == "COMPLETE":
         print(
@@ -3,6 +3,48 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 _hooks_dir = str(Path(__file__).resolve().parent.parent)
 if _hooks_dir not in sys.path:
     sys.path.insert(0, _hooks_dir)
+
+from _checkers.typescript import find_tool  # noqa: E402
+from _util import (  # noqa: E402
+    _get_compaction_threshold_pct,
+    _get_max_context_tokens,
+    _session_dir,
+    _session_id,
+    _stdin_payload,
+    cached_which,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_tool_caches():
+    """Reset memoized lookups so patches and temp files don't leak between tests."""
+    yield
+    _session_dir.cache_clear()
+    _session_id.cache_clear()
+    _stdin_payload.cache_clear()
+    cached_which.cache_clear()
+    _get_max_context_tokens.cache_clear()
+    _get_compaction_threshold_pct.cache_clear()
+    find_tool.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _no_length_warning(request, monkeypatch):
+    """Keep the file-length check out of the reason in modules that set CHECKER_MODULE."""
+    checker_module = getattr(request.module, "CHECKER_MODULE", None)
+    if checker_module:
+        monkeypatch.setattr(f"{checker_module}.check_file_length", lambda *_args: "")
+
+
+@pytest.fixture(scope="class")
+def source_file(request, tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """The module's CHECKER_SOURCE (name, text) written once and shared by one class. Do not modify it."""
+    name, text = request.module.CHECKER_SOURCE
+    path = tmp_path_factory.mktemp("src") / name
+    path.write_text(text)
+    return path
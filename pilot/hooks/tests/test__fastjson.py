@@ -0,0 +1,27 @@
+"""Tests for _fastjson module."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from _fastjson import dumps, loads
+
+
+class TestLoads:
+    """Tests for the loads shim."""
+
+    @pytest.mark.parametrize("payload", ['{"count": 2}', b'{"count": 2}'])
+    def test_accepts_str_and_bytes(self, payload):
+        assert loads(payload) == {"count": 2}
+
+    def test_invalid_input_raises_json_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            loads(b"not json")
+
+
+class TestDumps:
+    """Tests for the dumps shim."""
+
+    def test_returns_compact_utf8_bytes(self):
+        assert dumps({"title": "Plan ✓", "count": 2}) == '{"title":"Plan ✓","count":2}'.encode()
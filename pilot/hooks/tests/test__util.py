@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import io
 import json
+import os
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
 from _util import (
     BLUE,
     CYAN,
@@ -18,9 +21,11 @@ from _util import (
     RED,
     YELLOW,
     _sessions_base,
+    cached_which,
     find_git_root,
     get_edited_file_from_stdin,
     get_session_cache_path,
+    get_session_lint_cache_path,
     get_session_plan_path,
     is_waiting_for_user_input,
     read_hook_stdin,
@@ -110,6 +115,16 @@ class TestGetMaxContextTokens:
 
         assert result == 200_000
 
+    def test_config_read_once_per_process(self) -> None:
+        from _util import _get_compaction_threshold_pct, _get_max_context_tokens
+
+        with patch("_util._read_model_from_config", return_value="opus[1m]") as mock_read:
+            assert _get_max_context_tokens() == 1_000_000
+            assert _get_max_context_tokens() == 1_000_000
+            assert abs(_get_compaction_threshold_pct() - 96.7) < 0.1
+
+        mock_read.assert_called_once()
+
 
 class TestGetCompactionThresholdPct:
     """Tests for _get_compaction_threshold_pct()."""
@@ -182,6 +197,23 @@ class TestJsonHelpers:
         result = json.loads(stop_block("Spec workflow in progress"))
         assert result == {"decision": "block", "reason": "Spec workflow in progress"}
 
+    def test_helpers_match_json_dumps_of_full_response(self) -> None:
+        from _util import (
+            post_tool_use_block,
+            post_tool_use_context,
+            pre_tool_use_context,
+            pre_tool_use_deny,
+            stop_block,
+        )
+
+        text = 'Quote " backslash \\ newline \n unicode \u2014'
+        assert post_tool_use_block(text) == json.dumps({"decision": "block", "reason": text})
+        assert stop_block(text) == json.dumps({"decision": "block", "reason": text})
+        assert pre_tool_use_deny(text) == json.dumps({"permissionDecision": "deny", "reason": text})
+        for helper, event in ((post_tool_use_context, "PostToolUse"), (pre_tool_use_context, "PreToolUse")):
+            expected = {"hookSpecificOutput": {"hookEventName": event, "additionalContext": text}}
+            assert helper(text) == json.dumps(expected)
+
     def test_helpers_handle_special_chars(self) -> None:
         from _util import post_tool_use_block
 
@@ -190,48 +222,87 @@ class TestJsonHelpers:
         assert result["reason"] == msg
 
 
+def _numbered_lines_file(tmp_path_factory: pytest.TempPathFactory, name: str, count: int) -> Path:
+    f = tmp_path_factory.mktemp("file_length") / name
+    f.write_text("\n".join(f"line {i}" for i in range(count)))
+    return f
+
+
+@pytest.fixture(scope="module")
+def small_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A 100-line file, below the warning threshold. Read-only; shared by the module."""
+    return _numbered_lines_file(tmp_path_factory, "small.py", 100)
+
+
+@pytest.fixture(scope="module")
+def growing_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A 350-line file, past the warning threshold. Read-only; shared by the module."""
+    return _numbered_lines_file(tmp_path_factory, "growing.py", 350)
+
+
+@pytest.fixture(scope="module")
+def huge_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A 550-line file, past the critical threshold. Read-only; shared by the module."""
+    return _numbered_lines_file(tmp_path_factory, "huge.py", 550)
+
+
 class TestCheckFileLength:
     """Tests for check_file_length returning string."""
 
-    def test_returns_empty_for_normal_file(self, tmp_path: Path) -> None:
+    def test_returns_empty_for_normal_file(self, small_file: Path) -> None:
         from _util import check_file_length
 
-        f = tmp_path / "small.py"
-        f.write_text("\n".join(f"line {i}" for i in range(100)))
-        assert check_file_length(f) == ""
+        assert check_file_length(small_file) == ""
 
-    def test_returns_warning_for_long_file(self, tmp_path: Path) -> None:
+    def test_returns_warning_for_long_file(self, growing_file: Path) -> None:
         from _util import check_file_length
 
-        f = tmp_path / "growing.py"
-        f.write_text("\n".join(f"line {i}" for i in range(350)))
-        result = check_file_length(f)
+        result = check_file_length(growing_file)
         assert "growing.py" in result
         assert "350" in result
         assert "300" in result
 
-    def test_returns_critical_for_very_long_file(self, tmp_path: Path) -> None:
+    def test_returns_critical_for_very_long_file(self, huge_file: Path) -> None:
         from _util import check_file_length
 
-        f = tmp_path / "huge.py"
-        f.write_text("\n".join(f"line {i}" for i in range(550)))
-        result = check_file_length(f)
+        result = check_file_length(huge_file)
         assert "huge.py" in result
         assert "550" in result
         assert "500" in result
 
+    def test_small_file_is_not_read(self, tmp_path: Path) -> None:
+        from _util import FILE_LENGTH_WARN, check_file_length
+
+        f = tmp_path / "tiny.py"
+        f.write_text("\n" * FILE_LENGTH_WARN)
+        st = f.stat()
+        with patch("_util.os.open") as mock_open:
+            assert check_file_length(f, st) == ""
+        mock_open.assert_not_called()
+
+    def test_counts_unterminated_last_line(self, tmp_path: Path) -> None:
+        from _util import check_file_length
+
+        f = tmp_path / "no_trailing_newline.py"
+        f.write_text("\n".join(f"line {i}" for i in range(301)))
+        assert "301" in check_file_length(f)
+
+    def test_counts_lines_across_read_chunks(self, growing_file: Path) -> None:
+        from _util import check_file_length
+
+        with patch("_util._LINE_COUNT_CHUNK_BYTES", 7):
+            assert "350" in check_file_length(growing_file)
+
     def test_returns_empty_for_nonexistent_file(self, tmp_path: Path) -> None:
         from _util import check_file_length
 
         result = check_file_length(tmp_path / "nope.py")
         assert result == ""
 
-    def test_no_ansi_codes_in_output(self, tmp_path: Path) -> None:
+    def test_no_ansi_codes_in_output(self, huge_file: Path) -> None:
         from _util import check_file_length
 
-        f = tmp_path / "big.py"
-        f.write_text("\n".join(f"line {i}" for i in range(550)))
-        result = check_file_length(f)
+        result = check_file_length(huge_file)
         assert "\033[" not in result
 
 
@@ -287,6 +358,33 @@ class TestGetSessionCachePath:
         assert isinstance(path, Path)
         assert "default" in str(path)
 
+    @patch.dict("os.environ", {"PILOT_SESSION_ID": "test-session-123"})
+    def test_creates_session_dir_once(self, tmp_path):
+        with patch("_util._sessions_base", return_value=tmp_path) as mock_base:
+            first = get_session_cache_path()
+            second = get_session_cache_path()
+        assert first == second == tmp_path / "test-session-123" / "context-cache.json"
+        assert first.parent.is_dir()
+        mock_base.assert_called_once()
+
+    def test_session_id_read_once_per_process(self, tmp_path):
+        with patch("_util._sessions_base", return_value=tmp_path):
+            with patch.dict("os.environ", {"PILOT_SESSION_ID": "first"}):
+                first = get_session_cache_path()
+            with patch.dict("os.environ", {"PILOT_SESSION_ID": "second"}):
+                second = get_session_lint_cache_path()
+        assert first.parent == second.parent == tmp_path / "first"
+
+
+class TestGetSessionLintCachePath:
+    """Tests for get_session_lint_cache_path()."""
+
+    @patch.dict("os.environ", {"PILOT_SESSION_ID": "test-session-789"})
+    def test_returns_session_scoped_lint_cache_path(self):
+        path = get_session_lint_cache_path()
+        assert "test-session-789" in str(path)
+        assert path.name == "lint-cache.json"
+
 
 class TestGetSessionPlanPath:
     """Tests for get_session_plan_path()."""
@@ -301,6 +399,16 @@ class TestGetSessionPlanPath:
 
 
 
+class TestCachedWhich:
+    """Tests for cached_which()."""
+
+    def test_resolves_each_tool_once(self):
+        with patch("shutil.which", return_value="/usr/bin/ruff") as mock_which:
+            assert cached_which("ruff") == "/usr/bin/ruff"
+            assert cached_which("ruff") == "/usr/bin/ruff"
+        mock_which.assert_called_once_with("ruff")
+
+
 class TestFindGitRoot:
     """Tests for find_git_root()."""
 
@@ -323,46 +431,78 @@ class TestFindGitRoot:
 
 
 
+def _pipe_stdin(text: str) -> io.TextIOWrapper:
+    """Build a text stdin over a real OS pipe, like the one a hook is started with.
+
+    The payload is written and the write end closed up front, so reads see EOF
+    after it. The payload must fit in the pipe buffer.
+    """
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, text.encode())
+    os.close(write_fd)
+    return open(read_fd, encoding="utf-8")
+
 
 class TestReadHookStdin:
     """Tests for read_hook_stdin()."""
 
     def test_parses_valid_json(self, monkeypatch):
         test_data = {"tool_name": "Write", "tool_input": {"file_path": "test.py"}}
-        monkeypatch.setattr("sys.stdin", MagicMock(read=lambda: json.dumps(test_data)))
+        monkeypatch.setattr("sys.stdin", _pipe_stdin(json.dumps(test_data)))
         result = read_hook_stdin()
         assert result == test_data
 
     def test_returns_empty_dict_on_invalid_json(self, monkeypatch):
-        monkeypatch.setattr("sys.stdin", MagicMock(read=lambda: "not json"))
+        monkeypatch.setattr("sys.stdin", _pipe_stdin("not json"))
         result = read_hook_stdin()
         assert result == {}
 
     def test_returns_empty_dict_on_empty_input(self, monkeypatch):
-        monkeypatch.setattr("sys.stdin", MagicMock(read=lambda: ""))
+        monkeypatch.setattr("sys.stdin", _pipe_stdin(""))
         result = read_hook_stdin()
         assert result == {}
 
+    def test_reads_text_stdin_without_buffer(self, monkeypatch):
+        test_data = {"tool_name": "Write"}
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(test_data)))
+        assert read_hook_stdin() == test_data
+
+    def test_stdin_parsed_once_for_all_readers(self, monkeypatch):
+        test_data = {"tool_name": "Write", "tool_input": {"file_path": "/path/to/file.py"}}
+        stdin = _pipe_stdin(json.dumps(test_data))
+        monkeypatch.setattr("sys.stdin", stdin)
+        with (
+            patch("select.select", return_value=([stdin], [], [])),
+            patch("_util.loads", wraps=json.loads) as mock_loads,
+        ):
+            assert read_hook_stdin() == test_data
+            assert get_edited_file_from_stdin() == Path("/path/to/file.py")
+        mock_loads.assert_called_once()
+
 
 class TestGetEditedFileFromStdin:
     """Tests for get_edited_file_from_stdin()."""
 
     def test_extracts_file_path(self, monkeypatch):
         test_data = {"tool_input": {"file_path": "/path/to/file.py"}}
+        monkeypatch.setattr("sys.stdin", _pipe_stdin(json.dumps(test_data)))
         with patch("select.select") as mock_select:
             mock_select.return_value = ([sys.stdin], [], [])
-            monkeypatch.setattr("sys.stdin", MagicMock(read=lambda: json.dumps(test_data)))
-            with patch("json.load", return_value=test_data):
-                result = get_edited_file_from_stdin()
-                assert result == Path("/path/to/file.py")
+            result = get_edited_file_from_stdin()
+            assert result == Path("/path/to/file.py")
 
     def test_returns_none_without_file_path(self, monkeypatch):
         test_data = {"tool_input": {}}
+        monkeypatch.setattr("sys.stdin", _pipe_stdin(json.dumps(test_data)))
         with patch("select.select") as mock_select:
             mock_select.return_value = ([sys.stdin], [], [])
-            with patch("json.load", return_value=test_data):
-                result = get_edited_file_from_stdin()
-                assert result is None
+            result = get_edited_file_from_stdin()
+            assert result is None
+
+    def test_reads_ready_pipe_without_mocking_select(self, monkeypatch):
+        test_data = {"tool_input": {"file_path": "/path/to/file.py"}}
+        monkeypatch.setattr("sys.stdin", _pipe_stdin(json.dumps(test_data)))
+        assert get_edited_file_from_stdin() == Path("/path/to/file.py")
 
     def test_returns_none_when_stdin_empty(self, monkeypatch):
         with patch("select.select") as mock_select:
@@ -427,3 +567,19 @@ class TestIsWaitingForUserInput:
         lines = [json.dumps(ask_msg), json.dumps(write_msg)]
         transcript.write_text("\n".join(lines) + "\n")
         assert is_waiting_for_user_input(str(transcript)) is False
+
+    def test_finds_last_assistant_message_across_chunks(self, tmp_path):
+        transcript = tmp_path / "transcript.jsonl"
+        ask_msg = {
+            "type": "assistant",
+            "message": {
+                "content": [
+                    {"type": "tool_use", "name": "AskUserQuestion", "input": {}}
+                ]
+            },
+        }
+        user_msg = {"type": "user", "message": {"content": "x" * 200}}
+        lines = [json.dumps(user_msg), json.dumps(ask_msg), json.dumps(user_msg), json.dumps(user_msg)]
+        transcript.write_text("\n".join(lines) + "\n")
+        with patch("_util._TRANSCRIPT_CHUNK_BYTES", 16):
+            assert is_waiting_for_user_input(str(transcript)) is True
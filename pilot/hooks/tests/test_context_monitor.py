@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 import time
 from unittest.mock import patch
 
@@ -178,6 +179,18 @@ class TestIsThrottled:
 
         assert _is_throttled("test-session-123") is False
 
+    def test_throttle_skips_parsing_when_file_mtime_is_stale(self, tmp_path, monkeypatch):
+        """A cache file untouched for 30s+ is stale without being read."""
+        cache_file = tmp_path / "context_cache.json"
+        monkeypatch.setattr("context_monitor.get_session_cache_path", lambda: cache_file)
+
+        cache_file.write_text("not json")
+        old = time.time() - 60
+        os.utime(cache_file, (old, old))
+
+        with patch("context_monitor.loads", side_effect=AssertionError("cache parsed")):
+            assert _is_throttled("test-session-123") is False
+
 
 
 
@@ -3,53 +3,83 @@
 from __future__ import annotations
 
 import json
-import sys
-from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from _dashboard_notify import send_dashboard_notification
 
 
+def _mock_connection(status: int = 201) -> MagicMock:
+    conn = MagicMock()
+    conn.getresponse.return_value = MagicMock(status=status)
+    return conn
+
+
 class TestSendDashboardNotification:
-    @patch("_dashboard_notify.urllib.request.urlopen")
-    @patch("_dashboard_notify.urllib.request.Request")
-    def test_sends_notification_to_console_api(self, mock_request_cls, mock_urlopen):
+    @patch("http.client.HTTPConnection")
+    def test_sends_notification_to_console_api(self, mock_conn_cls):
         """Should POST notification to Console API."""
-        mock_response = MagicMock()
-        mock_response.status = 201
-        mock_urlopen.return_value = mock_response
+        conn = _mock_connection()
+        mock_conn_cls.return_value = conn
 
         result = send_dashboard_notification("plan_approval", "Plan Review", "Needs approval")
 
         assert result is True
-        mock_request_cls.assert_called_once()
-        call_args = mock_request_cls.call_args
-        assert "http://localhost:41777/api/notifications" in call_args[0][0]
-        body = json.loads(call_args[1]["data"])
+        mock_conn_cls.assert_called_once_with("localhost", 41777, timeout=3)
+        method, path = conn.request.call_args[0]
+        assert (method, path) == ("POST", "/api/notifications")
+        body = json.loads(conn.request.call_args[1]["body"])
         assert body["type"] == "plan_approval"
         assert body["title"] == "Plan Review"
         assert body["message"] == "Needs approval"
 
-    @patch("_dashboard_notify.urllib.request.urlopen")
-    @patch("_dashboard_notify.urllib.request.Request")
-    def test_includes_optional_plan_path(self, mock_request_cls, mock_urlopen):
+    @patch("http.client.HTTPConnection")
+    def test_includes_optional_plan_path(self, mock_conn_cls):
         """Should include planPath when provided."""
-        mock_urlopen.return_value = MagicMock(status=201)
+        conn = _mock_connection()
+        mock_conn_cls.return_value = conn
 
         send_dashboard_notification("info", "Title", "Msg", plan_path="/plans/test.md")
 
-        body = json.loads(mock_request_cls.call_args[1]["data"])
+        body = json.loads(conn.request.call_args[1]["body"])
         assert body["planPath"] == "/plans/test.md"
 
-    @patch("_dashboard_notify.urllib.request.urlopen", side_effect=Exception("Connection refused"))
-    def test_silently_ignores_connection_errors(self, mock_urlopen):
+    @patch("http.client.HTTPConnection")
+    def test_body_matches_json_encoding_of_payload(self, mock_conn_cls):
+        """Should send the same JSON as encoding the payload dict, special characters included."""
+        conn = _mock_connection()
+        mock_conn_cls.return_value = conn
+
+        send_dashboard_notification("info", 'Say "hi"', "caf\u00e9\nnext", plan_path="/plans/a b.md")
+
+        body = conn.request.call_args[1]["body"]
+        assert isinstance(body, bytes)
+        assert json.loads(body) == {
+            "type": "info",
+            "title": 'Say "hi"',
+            "message": "caf\u00e9\nnext",
+            "planPath": "/plans/a b.md",
+        }
+
+    @patch("http.client.HTTPConnection")
+    def test_closes_connection_after_sending(self, mock_conn_cls):
+        """Should close the connection once the response is in."""
+        conn = _mock_connection()
+        mock_conn_cls.return_value = conn
+
+        send_dashboard_notification("info", "Title", "Msg")
+
+        conn.close.assert_called_once()
+
+    @patch("http.client.HTTPConnection")
+    def test_silently_ignores_connection_errors(self, mock_conn_cls):
         """Should return False without raising on connection errors."""
+        mock_conn_cls.return_value.request.side_effect = ConnectionRefusedError("Connection refused")
         result = send_dashboard_notification("info", "Title", "Msg")
         assert result is False
 
-    @patch("_dashboard_notify.urllib.request.urlopen", side_effect=TimeoutError("timeout"))
-    def test_silently_ignores_timeout(self, mock_urlopen):
+    @patch("http.client.HTTPConnection")
+    def test_silently_ignores_timeout(self, mock_conn_cls):
         """Should return False without raising on timeout."""
+        mock_conn_cls.return_value.getresponse.side_effect = TimeoutError("timeout")
         result = send_dashboard_notification("info", "Title", "Msg")
         assert result is False
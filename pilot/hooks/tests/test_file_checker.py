@@ -4,57 +4,61 @@ from __future__ import annotations
 
 import io
 import json
+import os
 from unittest.mock import patch
 
-from file_checker import main
+import pytest
+from file_checker import _tdd_check, main
 
 
-def _make_stdin(tool_name: str, file_path: str) -> io.StringIO:
-    """Create a stdin mock with hook JSON data."""
-    data = {"tool_name": tool_name, "tool_input": {"file_path": file_path}}
-    return io.StringIO(json.dumps(data))
+@pytest.fixture(autouse=True)
+def _isolated_lint_cache(tmp_path):
+    """Keep the session lint cache out of the real ~/.pilot directory."""
+    with patch("file_checker.get_session_lint_cache_path", return_value=tmp_path / "lint-cache.json"):
+        yield
 
 
-def test_python_file_dispatches_to_python_checker(tmp_path):
-    """Python files are handled by Python checker."""
-    py_file = tmp_path / "test.py"
-    py_file.write_text("print('hello')\n")
+def _payload(tool_name: str, file_path: str, **tool_input) -> dict:
+    """Build the hook JSON data main() would otherwise parse from stdin."""
+    return {"tool_name": tool_name, "tool_input": {"file_path": file_path, **tool_input}}
 
-    with patch("sys.stdin", _make_stdin("Edit", str(py_file))):
-        with patch("file_checker.check_python") as mock_check:
-            mock_check.return_value = (0, "")
-            result = main()
 
-            mock_check.assert_called_once_with(py_file)
-            assert result == 0
+def _make_stdin(tool_name: str, file_path: str, **tool_input) -> io.StringIO:
+    """Create a stdin mock with hook JSON data."""
+    return io.StringIO(json.dumps(_payload(tool_name, file_path, **tool_input)))
 
 
-def test_typescript_file_dispatches_to_typescript_checker(tmp_path):
-    """TypeScript files are handled by TypeScript checker."""
-    ts_file = tmp_path / "test.ts"
-    ts_file.write_text("const x = 1;\n")
+@pytest.mark.parametrize(
+    ("suffix", "checker"),
+    [
+        (".py", "_checkers.python.check_python"),
+        (".ts", "_checkers.typescript.check_typescript"),
+        (".go", "_checkers.go.check_go"),
+    ],
+)
+def test_file_dispatches_to_language_checker(tmp_path, suffix, checker):
+    """Each supported suffix is handled by its language checker."""
+    source = tmp_path / f"test{suffix}"
+    source.write_text("x\n")
 
-    with patch("sys.stdin", _make_stdin("Edit", str(ts_file))):
-        with patch("file_checker.check_typescript") as mock_check:
-            mock_check.return_value = (0, "")
-            result = main()
+    with patch(checker, return_value=(0, "")) as mock_check:
+        result = main(_payload("Edit", str(source)))
 
-            mock_check.assert_called_once_with(ts_file)
-            assert result == 0
+    mock_check.assert_called_once()
+    assert mock_check.call_args.args[0] == source
+    assert result == 0
 
 
-def test_go_file_dispatches_to_go_checker(tmp_path):
-    """Go files are handled by Go checker."""
-    go_file = tmp_path / "test.go"
-    go_file.write_text("package main\n")
+def test_reads_hook_data_from_stdin(tmp_path):
+    """Without a payload argument, main() parses the hook JSON from stdin."""
+    py_file = tmp_path / "test.py"
+    py_file.write_text("print('hello')\n")
 
-    with patch("sys.stdin", _make_stdin("Edit", str(go_file))):
-        with patch("file_checker.check_go") as mock_check:
-            mock_check.return_value = (0, "")
-            result = main()
+    with patch("sys.stdin", _make_stdin("Edit", str(py_file))):
+        with patch("_checkers.python.check_python", return_value=(0, "")) as mock_check:
+            assert main() == 0
 
-            mock_check.assert_called_once_with(go_file)
-            assert result == 0
+    assert mock_check.call_args.args[0] == py_file
 
 
 def test_unsupported_file_returns_zero(tmp_path):
@@ -62,16 +66,39 @@ def test_unsupported_file_returns_zero(tmp_path):
     md_file = tmp_path / "test.md"
     md_file.write_text("# Heading\n")
 
-    with patch("sys.stdin", _make_stdin("Edit", str(md_file))):
-        result = main()
-        assert result == 0
+    result = main(_payload("Edit", str(md_file)))
+    assert result == 0
 
 
 def test_nonexistent_file_returns_zero():
     """Nonexistent files return 0."""
-    with patch("sys.stdin", _make_stdin("Edit", "/nonexistent/file.py")):
-        result = main()
-        assert result == 0
+    result = main(_payload("Edit", "/nonexistent/file.py"))
+    assert result == 0
+
+
+class TestNoopEdit:
+    """Edits that leave the file unchanged skip all checks."""
+
+    def test_identical_edit_skips_checkers(self, tmp_path):
+        py_file = tmp_path / "app.py"
+        py_file.write_text("x = 1\n")
+
+        with patch("_checkers.python.check_python") as mock_check:
+            with patch("file_checker._tdd_check") as mock_tdd:
+                assert main(_payload("Edit", str(py_file), old_string="x = 1", new_string="x = 1")) == 0
+
+        mock_check.assert_not_called()
+        mock_tdd.assert_not_called()
+
+    def test_identical_multiedit_skips_checkers(self, tmp_path):
+        py_file = tmp_path / "app.py"
+        py_file.write_text("x = 1\n")
+
+        edits = [{"old_string": "x = 1", "new_string": "x = 1"}]
+        with patch("_checkers.python.check_python") as mock_check:
+            assert main(_payload("MultiEdit", str(py_file), edits=edits)) == 0
+
+        mock_check.assert_not_called()
 
 
 class TestContextOutput:
@@ -82,10 +109,9 @@ class TestContextOutput:
         py_file = tmp_path / "app.py"
         py_file.write_text("x = 1\n")
 
-        with patch("sys.stdin", _make_stdin("Edit", str(py_file))):
-            with patch("file_checker.check_python") as mock_check:
-                mock_check.return_value = (2, "Python: 3 ruff issues in app.py")
-                main()
+        with patch("_checkers.python.check_python") as mock_check:
+            mock_check.return_value = (2, "Python: 3 ruff issues in app.py")
+            main(_payload("Edit", str(py_file)))
 
         captured = capsys.readouterr()
         output = json.loads(captured.out)
@@ -93,16 +119,27 @@ class TestContextOutput:
         assert output["hookSpecificOutput"]["hookEventName"] == "PostToolUse"
         assert "Python" in output["hookSpecificOutput"]["additionalContext"]
 
+    def test_combines_checker_and_tdd_reasons(self, tmp_path, capsys):
+        """Checker and TDD warnings are merged into one context block."""
+        py_file = tmp_path / "app.py"
+        py_file.write_text("x = 1\n")
+
+        with patch("_checkers.python.check_python", return_value=(0, "Python: 1 ruff in app.py")):
+            with patch("file_checker._tdd_check", return_value="TDD Reminder: No test file found"):
+                main(_payload("Edit", str(py_file)))
+
+        context = json.loads(capsys.readouterr().out)["hookSpecificOutput"]["additionalContext"]
+        assert context == "Python: 1 ruff in app.py\nTDD Reminder: No test file found"
+
     def test_no_output_when_clean(self, tmp_path, capsys):
         """Should print nothing when checks pass."""
         py_file = tmp_path / "app.py"
         py_file.write_text("x = 1\n")
 
-        with patch("sys.stdin", _make_stdin("Edit", str(py_file))):
-            with patch("file_checker.check_python") as mock_check:
-                mock_check.return_value = (0, "")
-                with patch("file_checker._tdd_check", return_value=""):
-                    main()
+        with patch("_checkers.python.check_python") as mock_check:
+            mock_check.return_value = (0, "")
+            with patch("file_checker._tdd_check", return_value=""):
+                main(_payload("Edit", str(py_file)))
 
         captured = capsys.readouterr()
         assert captured.out == ""
@@ -112,8 +149,87 @@ class TestContextOutput:
         md_file = tmp_path / "readme.md"
         md_file.write_text("# Hello\n")
 
-        with patch("sys.stdin", _make_stdin("Edit", str(md_file))):
-            main()
+        main(_payload("Edit", str(md_file)))
 
         captured = capsys.readouterr()
         assert captured.out == ""
+
+
+class TestLintCache:
+    """Unchanged files reuse the previous checker result."""
+
+    def test_unchanged_file_skips_checker(self, tmp_path, capsys):
+        """A second run on an untouched file re-emits the cached reason without linting."""
+        py_file = tmp_path / "app.py"
+        py_file.write_text("x = 1\n")
+
+        with patch("file_checker._tdd_check", return_value=""):
+            with patch("_checkers.python.check_python", return_value=(0, "Python: 1 ruff in app.py")) as mock_check:
+                main(_payload("Edit", str(py_file)))
+                main(_payload("Edit", str(py_file)))
+
+        assert mock_check.call_count == 1
+        outputs = capsys.readouterr().out.strip().splitlines()
+        assert len(outputs) == 2
+        assert all("Python: 1 ruff in app.py" in line for line in outputs)
+
+    def test_modified_file_reruns_checker(self, tmp_path):
+        """Changing the file contents invalidates the cached result."""
+        py_file = tmp_path / "app.py"
+        py_file.write_text("x = 1\n")
+
+        with patch("file_checker._tdd_check", return_value=""):
+            with patch("_checkers.python.check_python", return_value=(0, "")) as mock_check:
+                main(_payload("Edit", str(py_file)))
+                py_file.write_text("x = 1\ny = 2\n")
+                main(_payload("Edit", str(py_file)))
+
+        assert mock_check.call_count == 2
+
+    def test_identical_rewrite_reuses_result(self, tmp_path):
+        """Rewriting the same content bumps the mtime but still hits the cache."""
+        py_file = tmp_path / "app.py"
+        py_file.write_text("x = 1\n")
+
+        with patch("file_checker._tdd_check", return_value=""):
+            with patch("_checkers.python.check_python", return_value=(0, "")) as mock_check:
+                main(_payload("Write", str(py_file)))
+                st = py_file.stat()
+                os.utime(py_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+                main(_payload("Write", str(py_file)))
+
+        assert mock_check.call_count == 1
+
+    def test_cache_keeps_only_most_recent_entries(self, tmp_path):
+        """The oldest entries are dropped once the cache exceeds its cap."""
+        files = [tmp_path / f"mod{i}.py" for i in range(3)]
+        for f in files:
+            f.write_text("x = 1\n")
+
+        with (
+            patch("file_checker.LINT_CACHE_MAX_ENTRIES", 2),
+            patch("file_checker._tdd_check", return_value=""),
+            patch("_checkers.python.check_python", return_value=(0, "")),
+        ):
+            for f in files:
+                main(_payload("Edit", str(f)))
+
+        cache = json.loads((tmp_path / "lint-cache.json").read_bytes())
+        assert list(cache) == [str(files[1]), str(files[2])]
+
+
+class TestTddCheck:
+    """Tests for the failing-test lookup in _tdd_check."""
+
+    def test_stops_failing_test_walk_at_git_root(self, tmp_path):
+        """A pytest cache above the git root must not be consulted."""
+        repo = tmp_path / "repo"
+        src = repo / "pkg" / "app.py"
+        src.parent.mkdir(parents=True)
+        src.write_text("x = 1\n")
+
+        with patch("file_checker.has_related_failing_test", return_value=False) as mock_failing:
+            _tdd_check("Write", {"content": "x = 1\n"}, str(src), repo)
+
+        visited = [call.args[0] for call in mock_failing.call_args_list]
+        assert visited == [str(repo / "pkg"), str(repo)]
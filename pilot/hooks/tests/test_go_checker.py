@@ -2,80 +2,122 @@
 
 from __future__ import annotations
 
+import io
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from _checkers.go import check_go
 
+# Read by the conftest fixtures: length-check stub target and shared source file.
+CHECKER_MODULE = "_checkers.go"
+CHECKER_SOURCE = ("main.go", "package main\n")
+
+# Tool name -> resolved path, standing in for cached_which; missing tools resolve to None.
+_ALL_GO_TOOLS = {tool: f"/usr/bin/{tool}" for tool in ("go", "gofmt", "golangci-lint")}
+_GO_ONLY = {"go": _ALL_GO_TOOLS["go"]}
+_NO_GOFMT = {tool: path for tool, path in _ALL_GO_TOOLS.items() if tool != "gofmt"}
+
+
+def _fake_popen(outputs: dict[str, tuple[int, str]]):
+    """Build a Popen stand-in that streams canned (returncode, output) per go subcommand."""
+
+    def factory(cmd, **_kwargs):
+        returncode, output = outputs.get(cmd[1], (0, ""))
+        proc = MagicMock()
+        proc.__enter__.return_value = proc
+        proc.stdout = io.BytesIO(output.encode())
+        proc.wait.return_value = returncode
+        return proc
+
+    return factory
+
 
 class TestCheckGoVetCounting:
     """Verify go vet issue counting excludes header lines."""
 
-    def test_vet_count_excludes_package_header_lines(self, tmp_path: Path) -> None:
+    def test_vet_count_excludes_package_header_lines(self, source_file: Path) -> None:
         """go vet prefixes output with '# package-name' headers that should not be counted as issues."""
-        go_file = tmp_path / "main.go"
-        go_file.write_text("package main\n")
-
-        mock_result = MagicMock()
-        mock_result.returncode = 2
-        mock_result.stdout = ""
-        mock_result.stderr = (
+        vet_output = (
             "# command-line-arguments\n"
             "vet: ./main.go:5:6: x declared and not used\n"
         )
 
         with (
-            patch("_checkers.go.check_file_length", return_value=""),
-            patch("_checkers.go.shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name == "go" else None),
-            patch("_checkers.go.subprocess.run", return_value=mock_result),
+            patch("_checkers.go.cached_which", _GO_ONLY.get),
+            patch("_checkers.go.subprocess.Popen", side_effect=_fake_popen({"vet": (2, vet_output)})),
         ):
-            exit_code, reason = check_go(go_file)
+            exit_code, reason = check_go(source_file)
 
         assert exit_code == 0
         assert "1 vet" in reason, f"Expected '1 vet' but got: {reason}"
 
-    def test_vet_count_with_multiple_issues_and_header(self, tmp_path: Path) -> None:
+    def test_vet_count_with_multiple_issues_and_header(self, source_file: Path) -> None:
         """Multiple real issues should be counted, header excluded."""
-        go_file = tmp_path / "main.go"
-        go_file.write_text("package main\n")
-
-        mock_result = MagicMock()
-        mock_result.returncode = 2
-        mock_result.stdout = ""
-        mock_result.stderr = (
+        vet_output = (
             "# command-line-arguments\n"
             "vet: ./main.go:5:6: x declared and not used\n"
             "vet: ./main.go:6:2: y declared and not used\n"
         )
 
         with (
-            patch("_checkers.go.check_file_length", return_value=""),
-            patch("_checkers.go.shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name == "go" else None),
-            patch("_checkers.go.subprocess.run", return_value=mock_result),
+            patch("_checkers.go.cached_which", _GO_ONLY.get),
+            patch("_checkers.go.subprocess.Popen", side_effect=_fake_popen({"vet": (2, vet_output)})),
         ):
-            exit_code, reason = check_go(go_file)
+            exit_code, reason = check_go(source_file)
 
         assert exit_code == 0
         assert "2 vet" in reason, f"Expected '2 vet' but got: {reason}"
 
-    def test_vet_header_only_output_means_no_issues(self, tmp_path: Path) -> None:
+    def test_vet_header_only_output_means_no_issues(self, source_file: Path) -> None:
         """If go vet returns only a header line with no actual issues, treat as clean."""
-        go_file = tmp_path / "main.go"
-        go_file.write_text("package main\n")
+        with (
+            patch("_checkers.go.cached_which", _GO_ONLY.get),
+            patch("_checkers.go.subprocess.Popen", side_effect=_fake_popen({"vet": (1, "# command-line-arguments\n")})),
+        ):
+            _, reason = check_go(source_file)
+
+        assert reason == "", f"Expected no issues but got: {reason}"
+
+
+class TestCheckGoConcurrentLinters:
+    """go vet and golangci-lint run side by side after gofmt."""
 
-        mock_vet = MagicMock()
-        mock_vet.returncode = 1
-        mock_vet.stdout = ""
-        mock_vet.stderr = "# command-line-arguments\n"
+    def test_vet_and_lint_results_both_reported(self, source_file: Path) -> None:
+        """Issues from both concurrently-run linters are merged into one reason."""
+        outputs = {
+            "vet": (2, "vet: ./main.go:5:6: x declared and not used\n"),
+            "run": (1, "main.go:3:1: unused: y (unused)\n"),
+        }
 
         with (
-            patch("_checkers.go.check_file_length", return_value=""),
-            patch("_checkers.go.shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name == "go" else None),
-            patch("_checkers.go.subprocess.run", return_value=mock_vet),
+            patch("_checkers.go.cached_which", _ALL_GO_TOOLS.get),
+            patch("_checkers.go.subprocess.run", return_value=subprocess.CompletedProcess([], returncode=0)),
+            patch("_checkers.go.subprocess.Popen", side_effect=_fake_popen(outputs)),
         ):
-            _, reason = check_go(go_file)
+            _, reason = check_go(source_file)
 
-        assert reason == "", f"Expected no issues but got: {reason}"
+        assert "1 vet" in reason
+        assert "1 lint" in reason
+
+
+class TestCheckGoStreamedOutput:
+    """Long linter output is streamed and truncated for display."""
+
+    def test_long_lint_output_truncated(self, source_file: Path) -> None:
+        """Only the first ten lines are shown; the rest are summarized."""
+        lint_output = "".join(f"main.go:{i}:1: issue {i}\n" for i in range(1, 26))
+
+        with (
+            patch("_checkers.go.cached_which", _NO_GOFMT.get),
+            patch("_checkers.go.subprocess.Popen", side_effect=_fake_popen({"run": (1, lint_output)})),
+        ):
+            _, reason = check_go(source_file)
+
+        assert "25 lint" in reason
+        assert "main.go:10:1: issue 10" in reason
+        assert "main.go:11:1: issue 11" not in reason
+        assert "... and 15 more lines" in reason
 
 
 class TestCheckGoCommentsPreserved:
@@ -83,27 +125,21 @@ class TestCheckGoCommentsPreserved:
 
     def test_regular_comment_survives_check(self, tmp_path: Path) -> None:
         """Regular comments are preserved after check_go runs."""
-        go_file = tmp_path / "main.go"
-        go_file.write_text("package main // important doc comment\n")
+        source_file = tmp_path / "main.go"
+        source_file.write_text("package main // important doc comment\n")
 
-        with (
-            patch("_checkers.go.check_file_length", return_value=""),
-            patch("_checkers.go.shutil.which", return_value=None),
-        ):
-            check_go(go_file)
+        with patch("_checkers.go.cached_which", return_value=None):
+            check_go(source_file)
 
-        assert "// important doc comment" in go_file.read_text()
+        assert "// important doc comment" in source_file.read_text()
 
 
 class TestCheckGoTestFileSkip:
     """Test files should skip validation."""
 
-    def test_test_files_skip_checks(self, tmp_path: Path) -> None:
-        """Files ending in _test.go should return early."""
-        go_file = tmp_path / "main_test.go"
-        go_file.write_text("package main\n")
-
-        exit_code, reason = check_go(go_file)
+    def test_test_files_skip_checks(self) -> None:
+        """Files ending in _test.go should return early, before the file is touched."""
+        exit_code, reason = check_go(Path("main_test.go"))
 
         assert exit_code == 0
         assert reason == ""
@@ -112,22 +148,13 @@ class TestCheckGoTestFileSkip:
 class TestCheckGoCleanFile:
     """Clean files should pass."""
 
-    def test_clean_file_returns_success(self, tmp_path: Path) -> None:
+    def test_clean_file_returns_success(self, source_file: Path) -> None:
         """Clean Go file should return exit 0 with empty reason."""
-        go_file = tmp_path / "main.go"
-        go_file.write_text("package main\n")
-
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
-        mock_result.stderr = ""
-
         with (
-            patch("_checkers.go.check_file_length", return_value=""),
-            patch("_checkers.go.shutil.which", side_effect=lambda name: f"/usr/bin/{name}" if name == "go" else None),
-            patch("_checkers.go.subprocess.run", return_value=mock_result),
+            patch("_checkers.go.cached_which", _GO_ONLY.get),
+            patch("_checkers.go.subprocess.Popen", side_effect=_fake_popen({})),
         ):
-            exit_code, reason = check_go(go_file)
+            exit_code, reason = check_go(source_file)
 
         assert exit_code == 0
         assert reason == ""
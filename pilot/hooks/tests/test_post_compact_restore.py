@@ -3,14 +3,10 @@
 from __future__ import annotations
 
 import json
-import os
-import sys
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 class TestPostCompactRestoreHook:
     """Test SessionStart(compact) hook context restoration."""
@@ -4,13 +4,10 @@ from __future__ import annotations
 
 import json
 import os
-import sys
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 class TestPreCompactHook:
     """Test PreCompact hook state capture."""
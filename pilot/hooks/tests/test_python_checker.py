@@ -2,31 +2,35 @@
 
 from __future__ import annotations
 
+import json
+import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 from _checkers.python import check_python
 
+# Read by the conftest fixtures: length-check stub target and shared source file.
+CHECKER_MODULE = "_checkers.python"
+CHECKER_SOURCE = ("app.py", "x = 1\n")
+
+# cached_which results with ruff alone, and with ruff plus basedpyright.
+_RUFF_ONLY = {"ruff": "/usr/bin/ruff"}
+_RUFF_AND_BASEDPYRIGHT = {**_RUFF_ONLY, "basedpyright": "/usr/bin/basedpyright"}
+
 
 class TestCheckPythonTestFileSkip:
     """Test files should skip validation."""
 
-    def test_test_prefix_files_skip_checks(self, tmp_path: Path) -> None:
+    def test_test_prefix_files_skip_checks(self) -> None:
         """Files with test_ in name skip checks."""
-        py_file = tmp_path / "test_app.py"
-        py_file.write_text("x = undefined\n")
-
-        exit_code, reason = check_python(py_file)
+        exit_code, reason = check_python(Path("test_app.py"))
 
         assert exit_code == 0
         assert reason == ""
 
-    def test_spec_files_skip_checks(self, tmp_path: Path) -> None:
+    def test_spec_files_skip_checks(self) -> None:
         """Files with spec in name skip checks."""
-        py_file = tmp_path / "app_spec.py"
-        py_file.write_text("x = undefined\n")
-
-        exit_code, reason = check_python(py_file)
+        exit_code, reason = check_python(Path("app_spec.py"))
 
         assert exit_code == 0
         assert reason == ""
@@ -35,16 +39,10 @@ class TestCheckPythonTestFileSkip:
 class TestCheckPythonNoTools:
     """When no tools are available, skip gracefully."""
 
-    def test_no_tools_returns_zero(self, tmp_path: Path) -> None:
+    def test_no_tools_returns_zero(self, source_file: Path) -> None:
         """No ruff installed returns 0."""
-        py_file = tmp_path / "app.py"
-        py_file.write_text("x = 1\n")
-
-        with (
-            patch("_checkers.python.check_file_length", return_value=""),
-            patch("_checkers.python.shutil.which", return_value=None),
-        ):
-            exit_code, reason = check_python(py_file)
+        with patch("_checkers.python.cached_which", return_value=None):
+            exit_code, reason = check_python(source_file)
 
         assert exit_code == 0
         assert reason == ""
@@ -53,17 +51,25 @@ class TestCheckPythonNoTools:
 class TestCheckPythonRuffIssues:
     """Ruff issue detection and counting."""
 
-    def test_ruff_errors_reported_in_reason(self, tmp_path: Path) -> None:
+    def test_ruff_errors_reported_in_reason(self, source_file: Path) -> None:
         """Ruff errors are counted and reported."""
-        py_file = tmp_path / "app.py"
-        py_file.write_text("x = 1\n")
-
-        mock_format = MagicMock(returncode=0, stdout="", stderr="")
-        mock_fix = MagicMock(returncode=0, stdout="", stderr="")
-        mock_check = MagicMock(
+        mock_format = subprocess.CompletedProcess([], returncode=0, stdout=b"", stderr=b"")
+        mock_fix = subprocess.CompletedProcess([], returncode=0, stdout=b"", stderr=b"")
+        mock_check = subprocess.CompletedProcess(
+            [],
             returncode=1,
-            stdout="app.py:1:1: F401 unused import\napp.py:2:1: E302 expected 2 blank lines\n",
-            stderr="",
+            stdout=json.dumps(
+                [
+                    {"code": "F401", "message": "unused import", "filename": str(source_file), "location": {"row": 1}},
+                    {
+                        "code": "E302",
+                        "message": "expected 2 blank lines",
+                        "filename": str(source_file),
+                        "location": {"row": 2},
+                    },
+                ]
+            ).encode(),
+            stderr=b"",
         )
 
         def run_side_effect(cmd, **_kwargs):
@@ -73,39 +79,26 @@ class TestCheckPythonRuffIssues:
                 return mock_fix
             return mock_check
 
-        def which_side_effect(name):
-            if name == "ruff":
-                return "/usr/bin/ruff"
-            return None
-
         with (
-            patch("_checkers.python.check_file_length", return_value=""),
-            patch("_checkers.python.shutil.which", side_effect=which_side_effect),
+            patch("_checkers.python.cached_which", _RUFF_ONLY.get),
             patch("_checkers.python.subprocess.run", side_effect=run_side_effect),
         ):
-            exit_code, reason = check_python(py_file)
+            exit_code, reason = check_python(source_file)
 
         assert exit_code == 0
         assert "2 ruff" in reason
+        assert "  app.py:1 F401: unused import" in reason
+        assert "  app.py:2 E302: expected 2 blank lines" in reason
 
-    def test_ruff_clean_output_no_issues(self, tmp_path: Path) -> None:
+    def test_ruff_clean_output_no_issues(self, source_file: Path) -> None:
         """Ruff with no errors means clean."""
-        py_file = tmp_path / "app.py"
-        py_file.write_text("x = 1\n")
-
-        mock_result = MagicMock(returncode=0, stdout="", stderr="")
-
-        def which_side_effect(name):
-            if name == "ruff":
-                return "/usr/bin/ruff"
-            return None
+        mock_result = subprocess.CompletedProcess([], returncode=0, stdout=b"", stderr=b"")
 
         with (
-            patch("_checkers.python.check_file_length", return_value=""),
-            patch("_checkers.python.shutil.which", side_effect=which_side_effect),
+            patch("_checkers.python.cached_which", _RUFF_ONLY.get),
             patch("_checkers.python.subprocess.run", return_value=mock_result),
         ):
-            exit_code, reason = check_python(py_file)
+            exit_code, reason = check_python(source_file)
 
         assert exit_code == 0
         assert reason == ""
@@ -116,42 +109,32 @@ class TestCheckPythonCommentsPreserved:
 
     def test_regular_comment_survives_check(self, tmp_path: Path) -> None:
         """Regular comments are preserved after check_python runs."""
-        py_file = tmp_path / "app.py"
-        py_file.write_text("x = 1  # important doc comment\n")
+        source_file = tmp_path / "app.py"
+        source_file.write_text("x = 1  # important doc comment\n")
 
-        with (
-            patch("_checkers.python.check_file_length", return_value=""),
-            patch("_checkers.python.shutil.which", return_value=None),
-        ):
-            check_python(py_file)
+        with patch("_checkers.python.cached_which", return_value=None):
+            check_python(source_file)
 
-        assert "# important doc comment" in py_file.read_text()
+        assert "# important doc comment" in source_file.read_text()
 
 
 class TestCheckPythonRuffOnly:
     """Verify basedpyright is NOT called (removed from per-edit hooks)."""
 
-    def test_basedpyright_not_invoked_even_if_available(self, tmp_path: Path) -> None:
+    def test_basedpyright_not_invoked_even_if_available(self, source_file: Path) -> None:
         """Even when basedpyright is on PATH, it is not called."""
-        py_file = tmp_path / "app.py"
-        py_file.write_text("x = 1\n")
-
-        mock_result = MagicMock(returncode=0, stdout="", stderr="")
+        mock_result = subprocess.CompletedProcess([], returncode=0, stdout=b"", stderr=b"")
         called_commands: list[list[str]] = []
 
         def run_side_effect(cmd, **_kwargs):
             called_commands.append(cmd)
             return mock_result
 
-        def which_side_effect(name):
-            return f"/usr/bin/{name}" if name in ("ruff", "basedpyright") else None
-
         with (
-            patch("_checkers.python.check_file_length", return_value=""),
-            patch("_checkers.python.shutil.which", side_effect=which_side_effect),
+            patch("_checkers.python.cached_which", _RUFF_AND_BASEDPYRIGHT.get),
             patch("_checkers.python.subprocess.run", side_effect=run_side_effect),
         ):
-            check_python(py_file)
+            check_python(source_file)
 
         invoked_binaries = [cmd[0] for cmd in called_commands]
         assert not any("basedpyright" in b for b in invoked_binaries)
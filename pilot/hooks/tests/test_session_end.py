@@ -2,25 +2,24 @@
 
 from __future__ import annotations
 
-import os
 from unittest.mock import MagicMock, patch
 
+import pytest
 import session_end
 
 
-def test_returns_early_without_plugin_root():
+def test_returns_early_without_plugin_root(monkeypatch):
     """Should return 0 when CLAUDE_PLUGIN_ROOT is not set."""
-    with patch.dict(os.environ, {}, clear=True):
-        os.environ.pop("CLAUDE_PLUGIN_ROOT", None)
-        result = session_end.main()
+    monkeypatch.setattr("session_end.PLUGIN_ROOT", "")
+    result = session_end.main()
 
     assert result == 0
 
 
-def test_skips_stop_when_other_sessions_active():
+def test_skips_stop_when_other_sessions_active(monkeypatch):
     """Should skip worker stop when other Pilot sessions are running."""
+    monkeypatch.setattr("session_end.PLUGIN_ROOT", "/fake/plugin")
     with (
-        patch.dict(os.environ, {"CLAUDE_PLUGIN_ROOT": "/fake/plugin"}),
         patch("session_end._get_active_session_count", return_value=2),
         patch("session_end.subprocess.run") as mock_run,
     ):
@@ -30,11 +29,12 @@ def test_skips_stop_when_other_sessions_active():
     mock_run.assert_not_called()
 
 
-def test_stops_worker_when_no_other_sessions():
-    """Should stop worker when this is the only active session."""
+@pytest.mark.parametrize("session_count", [0, 1])
+def test_stops_worker_when_no_other_sessions(session_count, monkeypatch):
+    """Should stop worker when this is the only active session, or none are reported."""
+    monkeypatch.setattr("session_end.PLUGIN_ROOT", "/fake/plugin")
     with (
-        patch.dict(os.environ, {"CLAUDE_PLUGIN_ROOT": "/fake/plugin"}),
-        patch("session_end._get_active_session_count", return_value=1),
+        patch("session_end._get_active_session_count", return_value=session_count),
         patch("session_end.subprocess.run", return_value=MagicMock(returncode=0)) as mock_run,
     ):
         result = session_end.main()
@@ -42,16 +42,15 @@ def test_stops_worker_when_no_other_sessions():
     assert result == 0
     mock_run.assert_called_once()
     assert "stop" in str(mock_run.call_args)
+    assert mock_run.call_args.kwargs.get("close_fds") is False
 
 
-def test_stops_worker_when_zero_sessions():
-    """Should stop worker and return 0 when no sessions active."""
+def test_session_count_skips_spawn_without_pilot_binary(tmp_path):
+    """Should report zero sessions without spawning when the pilot binary is missing."""
     with (
-        patch.dict(os.environ, {"CLAUDE_PLUGIN_ROOT": "/fake/plugin"}),
-        patch("session_end._get_active_session_count", return_value=0),
-        patch("session_end.subprocess.run", return_value=MagicMock(returncode=0)) as mock_run,
+        patch("session_end.PILOT_BIN", tmp_path / "pilot"),
+        patch("session_end.subprocess.run") as mock_run,
     ):
-        result = session_end.main()
+        assert session_end._get_active_session_count() == 0
 
-    assert result == 0
-    mock_run.assert_called_once()
+    mock_run.assert_not_called()
@@ -7,91 +7,134 @@ all notifications via `pilot notify`. The stop guard only blocks/allows stops.
 from __future__ import annotations
 
 import json
-import sys
-import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from spec_stop_guard import main
+import pytest
+from spec_stop_guard import (
+    PLAN_HEADER_BYTES,
+    _read_state,
+    _write_state,
+    find_active_plan,
+    get_stop_guard_path,
+    main,
+)
+
+_STOP_PAYLOAD = json.dumps({"transcript_path": "/transcript.jsonl", "stop_hook_active": False})
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    """Point the stop guard at a state file under tmp_path."""
+    path = tmp_path / "spec-stop-guard"
+    with patch("spec_stop_guard.get_stop_guard_path", return_value=path):
+        yield path
 
 
 class TestSpecStopGuard:
+    @pytest.fixture(autouse=True)
+    def _stop_stdin(self, monkeypatch):
+        monkeypatch.setattr("sys.stdin", SimpleNamespace(read=lambda: _STOP_PAYLOAD))
+
     @patch("spec_stop_guard.find_active_plan")
     @patch("spec_stop_guard.is_waiting_for_user_input")
-    @patch("sys.stdin")
-    def test_allows_stop_when_waiting_for_input(self, mock_stdin, mock_waiting, mock_find_plan):
+    def test_allows_stop_when_waiting_for_input(self, mock_waiting, mock_find_plan):
         """Should allow stop (return 0) when waiting for user input."""
         mock_find_plan.return_value = (Path("/plan.md"), "PENDING")
         mock_waiting.return_value = True
-        mock_stdin.read.return_value = json.dumps({"transcript_path": "/transcript.jsonl", "stop_hook_active": False})
 
         result = main()
         assert result == 0
 
     @patch("spec_stop_guard.find_active_plan")
     @patch("spec_stop_guard.is_waiting_for_user_input")
-    @patch("spec_stop_guard.get_stop_guard_path")
     @patch("spec_stop_guard.time.time")
-    @patch("sys.stdin")
-    def test_allows_stop_on_cooldown_escape(
-        self, mock_stdin, mock_time, mock_guard_path, mock_waiting, mock_find_plan
-    ):
+    def test_allows_stop_on_cooldown_escape(self, mock_time, mock_waiting, mock_find_plan, state_path):
         """Should allow stop when cooldown escape hatch is triggered (double-stop)."""
         mock_find_plan.return_value = (Path("/plan.md"), "PENDING")
         mock_waiting.return_value = False
         mock_time.return_value = 100.0
+        state_path.write_text("50.0")
 
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".state") as f:
-            f.write("50.0")
-            state_path = Path(f.name)
-
-        mock_guard_path.return_value = state_path
-        mock_stdin.read.return_value = json.dumps({"transcript_path": "/transcript.jsonl", "stop_hook_active": False})
-
-        try:
-            result = main()
-            assert result == 0
-        finally:
-            state_path.unlink(missing_ok=True)
+        result = main()
+        assert result == 0
 
     @patch("spec_stop_guard.find_active_plan")
-    @patch("sys.stdin")
-    def test_allows_stop_when_no_active_plan(self, mock_stdin, mock_find_plan):
+    def test_allows_stop_when_no_active_plan(self, mock_find_plan):
         """Should allow stop when there's no active plan."""
         mock_find_plan.return_value = (None, None)
-        mock_stdin.read.return_value = json.dumps({"transcript_path": "/transcript.jsonl", "stop_hook_active": False})
 
         result = main()
         assert result == 0
 
     @patch("spec_stop_guard.find_active_plan")
     @patch("spec_stop_guard.is_waiting_for_user_input")
-    @patch("spec_stop_guard.get_stop_guard_path")
     @patch("spec_stop_guard.time.time")
-    @patch("sys.stdin")
-    def test_blocks_stop_when_outside_cooldown(
-        self, mock_stdin, mock_time, mock_guard_path, mock_waiting, mock_find_plan, capsys
-    ):
+    def test_blocks_stop_when_outside_cooldown(self, mock_time, mock_waiting, mock_find_plan, state_path, capsys):
         """Should block stop and output JSON when outside cooldown window."""
         mock_find_plan.return_value = (Path("/plan.md"), "PENDING")
         mock_waiting.return_value = False
         mock_time.return_value = 200.0
+        state_path.write_text("100.0")
 
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".state") as f:
-            f.write("100.0")
-            state_path = Path(f.name)
-
-        mock_guard_path.return_value = state_path
-        mock_stdin.read.return_value = json.dumps({"transcript_path": "/transcript.jsonl", "stop_hook_active": False})
+        result = main()
 
+        assert result == 0
+        captured = capsys.readouterr()
+        data = json.loads(captured.out)
+        assert data["decision"] == "block"
+        assert "/plan.md" in data["reason"]
+
+
+class TestFindActivePlan:
+    def test_returns_plan_and_status_from_session_json(self, tmp_path):
+        """Should resolve the plan referenced by active_plan.json and read its status."""
+        plan_file = tmp_path / "plan.md"
+        plan_file.write_text("# Plan\n\nStatus: PENDING\nApproved: Yes\n")
+        plan_json = tmp_path / "active_plan.json"
+        plan_json.write_text(json.dumps({"plan_path": str(plan_file)}))
+
+        with patch("spec_stop_guard.get_session_plan_path", return_value=plan_json):
+            assert find_active_plan() == (plan_file, "PENDING")
+
+    def test_reads_only_plan_header(self, tmp_path):
+        """Should ignore a Status line that appears past the header window."""
+        plan_file = tmp_path / "plan.md"
+        plan_file.write_text("# Plan\n" + "x" * PLAN_HEADER_BYTES + "\nStatus: PENDING\n")
+        plan_json = tmp_path / "active_plan.json"
+        plan_json.write_text(json.dumps({"plan_path": str(plan_file)}))
+
+        with patch("spec_stop_guard.get_session_plan_path", return_value=plan_json):
+            assert find_active_plan() == (None, None)
+
+    def test_returns_none_when_session_json_missing(self, tmp_path):
+        """Should treat a missing active_plan.json as no active plan."""
+        with patch("spec_stop_guard.get_session_plan_path", return_value=tmp_path / "missing.json"):
+            assert find_active_plan() == (None, None)
+
+
+class TestGetStopGuardPath:
+    def test_resolved_once_per_process(self, tmp_path):
+        """Should create the guard directory once and reuse the cached path."""
+        get_stop_guard_path.cache_clear()
         try:
-            result = main()
-
-            assert result == 0
-            captured = capsys.readouterr()
-            data = json.loads(captured.out)
-            assert data["decision"] == "block"
-            assert "/plan.md" in data["reason"]
+            with patch("spec_stop_guard._sessions_base", return_value=tmp_path) as mock_base:
+                first = get_stop_guard_path()
+                second = get_stop_guard_path()
+            assert first == second
+            assert first.parent.is_dir()
+            mock_base.assert_called_once()
         finally:
-            state_path.unlink(missing_ok=True)
+            get_stop_guard_path.cache_clear()
+
+
+class TestStateFile:
+    def test_write_truncates_and_read_round_trips(self, tmp_path):
+        """Should replace any previous timestamp and read it back as bytes."""
+        state_file = tmp_path / "spec-stop-guard"
+        state_file.write_text("1234567890.123456789")
+
+        _write_state(state_file, 42.5)
+
+        assert _read_state(state_file) == b"42.5"
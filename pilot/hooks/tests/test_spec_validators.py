@@ -3,172 +3,144 @@
 from __future__ import annotations
 
 import datetime
+import io
 import json
-import os
-import subprocess
-import sys
-import tempfile
 from pathlib import Path
 
-PROJECT_ROOT = str(Path(__file__).parent.parent.parent.parent)
+import pytest
+from spec_plan_validator import main as plan_main
+from spec_verify_validator import main as verify_main
+
+
+def _ask_user_transcript(directory: Path) -> Path:
+    """Write a transcript whose last assistant action is AskUserQuestion."""
+    transcript = directory / "transcript.jsonl"
+    msg = {
+        "type": "assistant",
+        "message": {
+            "content": [
+                {"type": "tool_use", "name": "AskUserQuestion", "input": {}}
+            ]
+        },
+    }
+    transcript.write_text(json.dumps(msg) + "\n")
+    return transcript
+
+
+@pytest.fixture(scope="class")
+def plans_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A docs/plans skeleton created once per test class; tests write only leaf plan files."""
+    plans = tmp_path_factory.mktemp("project") / "docs" / "plans"
+    plans.mkdir(parents=True)
+    return plans
 
 
 class TestSpecPlanValidator:
     """Test spec_plan_validator.py Stop hook."""
 
-    def test_allows_stop_when_plan_created(self):
+    @pytest.fixture(autouse=True)
+    def _in_tmp_path(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+    def _run_validator(self, input_data: dict, monkeypatch) -> int:
+        """Run spec_plan_validator.main with input_data on stdin."""
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(input_data)))
+        return plan_main()
+
+    def test_allows_stop_when_plan_created(self, plans_dir, monkeypatch, capsys):
         """Should allow stop when plan file exists for today."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            today = datetime.date.today().strftime("%Y-%m-%d")
-            plan_path = Path(tmpdir) / "docs" / "plans" / f"{today}-test-feature.md"
-            plan_path.parent.mkdir(parents=True, exist_ok=True)
-            plan_path.write_text("# Test Plan\n\nStatus: PENDING\n")
-
-            result = subprocess.run(
-                [sys.executable, "pilot/hooks/spec_plan_validator.py"],
-                input=json.dumps({"project_root": tmpdir, "stop_hook_active": False}),
-                capture_output=True,
-                text=True,
-                cwd=PROJECT_ROOT,
-            )
-
-            assert result.returncode == 0, f"Should allow stop when plan exists. stderr: {result.stderr}"
-
-    def test_blocks_stop_when_no_plan(self):
+        today = datetime.date.today().strftime("%Y-%m-%d")
+        (plans_dir / f"{today}-test-feature.md").write_text("# Test Plan\n\nStatus: PENDING\n")
+        project_root = plans_dir.parent.parent
+
+        result = self._run_validator({"project_root": str(project_root), "stop_hook_active": False}, monkeypatch)
+
+        assert result == 0
+        assert capsys.readouterr().out == ""
+
+    def test_blocks_stop_when_no_plan(self, tmp_path, monkeypatch, capsys):
         """Should output block decision when no plan file exists."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = subprocess.run(
-                [sys.executable, "pilot/hooks/spec_plan_validator.py"],
-                input=json.dumps({"project_root": tmpdir, "stop_hook_active": False}),
-                capture_output=True,
-                text=True,
-                cwd=PROJECT_ROOT,
-            )
-
-            assert result.returncode == 0, f"Unexpected return code. stderr: {result.stderr}"
-            assert "Plan file not created yet" in result.stdout
-
-    def test_escape_hatch_allows_stop(self):
+        result = self._run_validator({"project_root": str(tmp_path), "stop_hook_active": False}, monkeypatch)
+
+        assert result == 0
+        assert "Plan file not created yet" in capsys.readouterr().out
+
+    def test_escape_hatch_allows_stop(self, tmp_path, monkeypatch, capsys):
         """Should allow stop when stop_hook_active is true (escape hatch)."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = subprocess.run(
-                [sys.executable, "pilot/hooks/spec_plan_validator.py"],
-                input=json.dumps({"project_root": tmpdir, "stop_hook_active": True}),
-                capture_output=True,
-                text=True,
-                cwd=PROJECT_ROOT,
-            )
-
-            assert result.returncode == 0, f"Escape hatch should allow stop. stderr: {result.stderr}"
-
-    def test_allows_stop_when_asking_user_question(self):
+        result = self._run_validator({"project_root": str(tmp_path), "stop_hook_active": True}, monkeypatch)
+
+        assert result == 0
+        assert capsys.readouterr().out == ""
+
+    def test_allows_stop_when_asking_user_question(self, tmp_path, monkeypatch, capsys):
         """Should allow stop when AskUserQuestion was the last tool."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            transcript = Path(tmpdir) / "transcript.jsonl"
-            msg = {
-                "type": "assistant",
-                "message": {
-                    "content": [
-                        {"type": "tool_use", "name": "AskUserQuestion", "input": {}}
-                    ]
-                },
-            }
-            transcript.write_text(json.dumps(msg) + "\n")
-
-            result = subprocess.run(
-                [sys.executable, "pilot/hooks/spec_plan_validator.py"],
-                input=json.dumps({
-                    "project_root": tmpdir,
-                    "stop_hook_active": False,
-                    "transcript_path": str(transcript),
-                }),
-                capture_output=True,
-                text=True,
-                cwd=PROJECT_ROOT,
-            )
-
-            assert result.returncode == 0, f"Should allow stop during AskUserQuestion. stderr: {result.stderr}"
+        transcript = _ask_user_transcript(tmp_path)
+
+        result = self._run_validator(
+            {
+                "project_root": str(tmp_path),
+                "stop_hook_active": False,
+                "transcript_path": str(transcript),
+            },
+            monkeypatch,
+        )
+
+        assert result == 0
+        assert capsys.readouterr().out == ""
 
 
 class TestSpecVerifyValidator:
     """Test spec_verify_validator.py Stop hook."""
 
-    TEST_SESSION_ID = "_test_verify_validator_"
-
-    def _setup_active_plan(self, plan_path: Path) -> Path:
-        """Write active_plan.json in an isolated test session directory."""
-        session_dir = Path.home() / ".pilot" / "sessions" / self.TEST_SESSION_ID
-        session_dir.mkdir(parents=True, exist_ok=True)
-        active_plan_json = session_dir / "active_plan.json"
-        active_plan_json.write_text(json.dumps({"plan_path": str(plan_path)}))
-        return active_plan_json
-
-    def _run_validator(self, input_data: dict) -> subprocess.CompletedProcess:
-        """Run spec_verify_validator with isolated PILOT_SESSION_ID."""
-        env = {**os.environ, "PILOT_SESSION_ID": self.TEST_SESSION_ID}
-        return subprocess.run(
-            [sys.executable, "pilot/hooks/spec_verify_validator.py"],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True,
-            cwd=PROJECT_ROOT,
-            env=env,
-        )
+    @pytest.fixture(autouse=True)
+    def _in_tmp_path(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+    def _setup_active_plan(self, plan_path: Path, monkeypatch) -> None:
+        """Serve an active plan pointing at plan_path without touching ~/.pilot."""
+        monkeypatch.setattr("spec_verify_validator._read_active_plan", lambda _sid: {"plan_path": str(plan_path)})
+
+    def _write_plan(self, plans_dir: Path, status: str) -> Path:
+        plan_path = plans_dir / "2026-02-11-test.md"
+        plan_path.write_text(f"# Test\n\nStatus: {status}\n")
+        return plan_path
 
-    def test_allows_stop_when_status_changed(self):
+    def _run_validator(self, input_data: dict, monkeypatch) -> int:
+        """Run spec_verify_validator.main with input_data on stdin."""
+        monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps(input_data)))
+        return verify_main()
+
+    def test_allows_stop_when_status_changed(self, tmp_path, plans_dir, monkeypatch, capsys):
         """Should allow stop when plan status is not COMPLETE."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            plan_path = Path(tmpdir) / "docs" / "plans" / "2026-02-11-test.md"
-            plan_path.parent.mkdir(parents=True, exist_ok=True)
-            plan_path.write_text("# Test\n\nStatus: VERIFIED\n")
-
-            active_plan_json = self._setup_active_plan(plan_path)
-            try:
-                result = self._run_validator({"project_root": tmpdir, "stop_hook_active": False})
-                assert result.returncode == 0, f"Should allow stop when VERIFIED. stderr: {result.stderr}"
-            finally:
-                active_plan_json.unlink(missing_ok=True)
-
-    def test_blocks_stop_when_status_complete(self):
+        self._setup_active_plan(self._write_plan(plans_dir, "VERIFIED"), monkeypatch)
+
+        result = self._run_validator({"project_root": str(tmp_path), "stop_hook_active": False}, monkeypatch)
+
+        assert result == 0
+        assert capsys.readouterr().out == ""
+
+    def test_blocks_stop_when_status_complete(self, tmp_path, plans_dir, monkeypatch, capsys):
         """Should output block decision when plan status is still COMPLETE."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            plan_path = Path(tmpdir) / "docs" / "plans" / "2026-02-11-test.md"
-            plan_path.parent.mkdir(parents=True, exist_ok=True)
-            plan_path.write_text("# Test\n\nStatus: COMPLETE\n")
-
-            active_plan_json = self._setup_active_plan(plan_path)
-            try:
-                result = self._run_validator({"project_root": tmpdir, "stop_hook_active": False})
-                assert result.returncode == 0, f"Unexpected return code. stderr: {result.stderr}"
-                assert "status was not updated" in result.stdout.lower()
-            finally:
-                active_plan_json.unlink(missing_ok=True)
-
-    def test_allows_stop_when_asking_user_question(self):
+        self._setup_active_plan(self._write_plan(plans_dir, "COMPLETE"), monkeypatch)
+
+        result = self._run_validator({"project_root": str(tmp_path), "stop_hook_active": False}, monkeypatch)
+
+        assert result == 0
+        assert "status was not updated" in capsys.readouterr().out.lower()
+
+    def test_allows_stop_when_asking_user_question(self, tmp_path, plans_dir, monkeypatch, capsys):
         """Should allow stop when AskUserQuestion was the last tool."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            plan_path = Path(tmpdir) / "docs" / "plans" / "2026-02-11-test.md"
-            plan_path.parent.mkdir(parents=True, exist_ok=True)
-            plan_path.write_text("# Test\n\nStatus: COMPLETE\n")
-
-            transcript = Path(tmpdir) / "transcript.jsonl"
-            msg = {
-                "type": "assistant",
-                "message": {
-                    "content": [
-                        {"type": "tool_use", "name": "AskUserQuestion", "input": {}}
-                    ]
-                },
-            }
-            transcript.write_text(json.dumps(msg) + "\n")
-
-            active_plan_json = self._setup_active_plan(plan_path)
-            try:
-                result = self._run_validator({
-                    "project_root": tmpdir,
-                    "stop_hook_active": False,
-                    "transcript_path": str(transcript),
-                })
-                assert result.returncode == 0, f"Should allow stop during AskUserQuestion. stderr: {result.stderr}"
-            finally:
-                active_plan_json.unlink(missing_ok=True)
+        self._setup_active_plan(self._write_plan(plans_dir, "COMPLETE"), monkeypatch)
+        transcript = _ask_user_transcript(tmp_path)
+
+        result = self._run_validator(
+            {
+                "project_root": str(tmp_path),
+                "stop_hook_active": False,
+                "transcript_path": str(transcript),
+            },
+            monkeypatch,
+        )
+
+        assert result == 0
+        assert capsys.readouterr().out == ""
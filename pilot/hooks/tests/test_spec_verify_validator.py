@@ -3,12 +3,9 @@
 from __future__ import annotations
 
 import json
-import sys
-from pathlib import Path
 from unittest.mock import patch
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from spec_verify_validator import main
+from spec_verify_validator import _read_active_plan, main
 
 
 class TestSpecVerifyValidator:
@@ -85,3 +82,17 @@ class TestSpecVerifyValidator:
                     result = main()
 
         assert result == 0
+
+
+class TestReadActivePlan:
+    def test_returns_none_for_invalid_json(self, tmp_path):
+        session_dir = tmp_path / ".pilot" / "sessions" / "bad-json"
+        session_dir.mkdir(parents=True)
+        (session_dir / "active_plan.json").write_text("{not json")
+
+        with patch("pathlib.Path.home", return_value=tmp_path):
+            assert _read_active_plan("bad-json") is None
+
+    def test_returns_none_when_missing(self, tmp_path):
+        with patch("pathlib.Path.home", return_value=tmp_path):
+            assert _read_active_plan("missing") is None
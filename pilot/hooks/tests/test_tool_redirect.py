@@ -3,18 +3,18 @@
 from __future__ import annotations
 
 import json
-from io import StringIO
+from io import BytesIO, StringIO, TextIOWrapper
 from unittest.mock import patch
 
 import pytest
-from tool_redirect import block, hint, is_semantic_pattern, run_tool_redirect
+from tool_redirect import Redirect, block, hint, is_semantic_pattern, run_tool_redirect
 
 
 class TestBlock:
     """Tests for block() output format."""
 
     def test_returns_2_and_outputs_deny_json(self, capsys):
-        info = {"message": "Tool blocked", "alternative": "Use X instead", "example": "X foo"}
+        info = Redirect(message="Tool blocked", alternative="Use X instead", example="X foo")
         result = block(info)
         assert result == 2
         captured = capsys.readouterr()
@@ -29,7 +29,7 @@ class TestHint:
     """Tests for hint() output format."""
 
     def test_returns_0_and_outputs_additional_context(self, capsys):
-        info = {"message": "Better alternative exists", "alternative": "Use Y", "example": "Y bar"}
+        info = Redirect(message="Better alternative exists", alternative="Use Y", example="Y bar")
         result = hint(info)
         assert result == 0
         captured = capsys.readouterr()
@@ -39,6 +39,12 @@ class TestHint:
         assert "Better alternative exists" in data["hookSpecificOutput"]["additionalContext"]
         assert captured.err == ""
 
+    def test_substitutes_pattern_placeholder(self, capsys):
+        info = Redirect(message="Try search", alternative="Use Z", example='Z "<pattern>"')
+        hint(info, "where is config")
+        context = json.loads(capsys.readouterr().out)["hookSpecificOutput"]["additionalContext"]
+        assert context.endswith('Example: Z "where is config"')
+
 
 class TestIsSemanticPattern:
     """Tests for semantic vs code pattern detection."""
@@ -52,6 +58,7 @@ class TestIsSemanticPattern:
             "what are the API endpoints",
             "looking for error handling",
             "locate all test fixtures",
+            "Where Is config loaded",
         ],
     )
     def test_detects_semantic_patterns(self, pattern: str):
@@ -69,6 +76,7 @@ class TestIsSemanticPattern:
             "interface UserProps",
             "x == y",
             "result != None",
+            "Class Handler",
         ],
     )
     def test_rejects_code_patterns(self, pattern: str):
@@ -110,6 +118,12 @@ class TestBlockedTools:
         result = _run_with_input("ExitPlanMode")
         assert result == 2
 
+    def test_blocks_plan_subagent(self, capsys):
+        result = _run_with_input("Task", {"subagent_type": "Plan"})
+        assert result == 2
+        message = "Task(subagent_type='Plan') is blocked (project uses /spec workflow)"
+        assert capsys.readouterr().err == f"\033[0;31m[Pilot] {message}\033[0m\n"
+
 
 class TestHintedTools:
     """Tests for tools that get hints but are allowed (exit code 0)."""
@@ -187,3 +201,15 @@ class TestEdgeCases:
         with patch("sys.stdin", stdin):
             result = run_tool_redirect()
         assert result == 0
+
+    def test_handles_non_object_payload(self):
+        stdin = StringIO(json.dumps(["WebSearch"]))
+        with patch("sys.stdin", stdin):
+            result = run_tool_redirect()
+        assert result == 0
+
+    def test_parses_byte_buffer_under_stdin(self):
+        stdin = TextIOWrapper(BytesIO(json.dumps({"tool_name": "WebSearch", "tool_input": {}}).encode()))
+        with patch("sys.stdin", stdin):
+            result = run_tool_redirect()
+        assert result == 2
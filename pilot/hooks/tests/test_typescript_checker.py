@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import json
+import subprocess
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
+from _checkers import TS_EXTENSIONS
 from _checkers.typescript import (
-    TS_EXTENSIONS,
     check_typescript,
     find_project_root,
     find_tool,
@@ -63,152 +66,150 @@ class TestFindTool:
 
     def test_falls_back_to_which(self, tmp_path: Path) -> None:
         """Falls back to shutil.which when no local binary."""
-        with patch("_checkers.typescript.shutil.which", return_value="/usr/bin/eslint"):
+        with patch("_checkers.typescript.cached_which", return_value="/usr/bin/eslint"):
             result = find_tool("eslint", tmp_path)
 
         assert result == "/usr/bin/eslint"
 
     def test_returns_none_when_not_found(self, tmp_path: Path) -> None:
         """Returns None when tool is not found anywhere."""
-        with patch("_checkers.typescript.shutil.which", return_value=None):
+        with patch("_checkers.typescript.cached_which", return_value=None):
             result = find_tool("eslint", tmp_path)
 
         assert result is None
 
     def test_which_fallback_with_no_project_root(self) -> None:
         """Falls back to which when project_root is None."""
-        with patch("_checkers.typescript.shutil.which", return_value="/usr/bin/tsc"):
+        with patch("_checkers.typescript.cached_which", return_value="/usr/bin/tsc"):
             result = find_tool("tsc", None)
 
         assert result == "/usr/bin/tsc"
 
 
-class TestCheckTypescriptTestFileSkip:
-    """Test files should skip validation."""
+_CLEAN_ESLINT = json.dumps([{"filePath": "app.ts", "errorCount": 0, "warningCount": 0, "messages": []}]).encode()
 
-    def test_test_files_skip_checks(self, tmp_path: Path) -> None:
-        """Files with .test. in name skip checks."""
-        ts_file = tmp_path / "app.test.ts"
-        ts_file.write_text("const x: string = 123;\n")
 
-        exit_code, reason = check_typescript(ts_file)
+def _tools(*available: str):
+    """find_tool stand-in resolving only the named tools to /usr/bin."""
+    return lambda name, _project_root: f"/usr/bin/{name}" if name in available else None
+
+
+@pytest.fixture
+def ts_mocks(monkeypatch):
+    """Stub check_typescript's collaborators; tests tweak find_tool, run or project_root as needed.
+
+    Defaults: no project root, prettier and eslint installed, every command
+    succeeds with a clean eslint report.
+    """
+    mocks = SimpleNamespace(
+        find_project_root=MagicMock(return_value=None),
+        find_tool=MagicMock(side_effect=_tools("prettier", "eslint")),
+        run=MagicMock(return_value=subprocess.CompletedProcess([], returncode=0, stdout=_CLEAN_ESLINT, stderr=b"")),
+    )
+    monkeypatch.setattr("_checkers.typescript.check_file_length", lambda *_args: "")
+    monkeypatch.setattr("_checkers.typescript.find_project_root", mocks.find_project_root)
+    monkeypatch.setattr("_checkers.typescript.find_tool", mocks.find_tool)
+    monkeypatch.setattr("_checkers.typescript.subprocess.run", mocks.run)
+    return mocks
 
-        assert exit_code == 0
-        assert reason == ""
 
-    def test_spec_files_skip_checks(self, tmp_path: Path) -> None:
-        """Files with .spec. in name skip checks."""
-        ts_file = tmp_path / "app.spec.tsx"
-        ts_file.write_text("const x: string = 123;\n")
+def _invoked(ts_mocks) -> list[list[str]]:
+    """Commands passed to subprocess.run, in call order."""
+    return [call.args[0] for call in ts_mocks.run.call_args_list]
 
-        exit_code, reason = check_typescript(ts_file)
+
+class TestCheckTypescriptTestFileSkip:
+    """Test files should skip validation."""
+
+    @pytest.mark.parametrize("name", ["app.test.ts", "app.spec.tsx"])
+    def test_test_and_spec_files_skip_checks(self, name: str, ts_mocks) -> None:
+        """Files with .test. or .spec. in the name return before any tool runs."""
+        exit_code, reason = check_typescript(Path(name))
 
         assert exit_code == 0
         assert reason == ""
+        ts_mocks.run.assert_not_called()
 
 
 class TestCheckTypescriptNoTools:
     """When no tools are available, skip gracefully."""
 
-    def test_no_tools_returns_zero(self, tmp_path: Path) -> None:
-        """No eslint or tsc installed returns 0."""
-        ts_file = tmp_path / "app.ts"
-        ts_file.write_text("const x = 1;\n")
+    def test_no_tools_returns_zero(self, ts_mocks) -> None:
+        """No prettier or eslint installed returns 0 without running anything."""
+        ts_mocks.find_tool.side_effect = _tools()
 
-        with (
-            patch("_checkers.typescript.check_file_length", return_value=""),
-            patch("_checkers.typescript.find_project_root", return_value=None),
-            patch("_checkers.typescript.find_tool", return_value=None),
-        ):
-            exit_code, reason = check_typescript(ts_file)
+        exit_code, reason = check_typescript(Path("app.ts"))
 
         assert exit_code == 0
         assert reason == ""
+        ts_mocks.run.assert_not_called()
 
 
 class TestCheckTypescriptEslintIssues:
     """ESLint issue detection and counting."""
 
-    def test_eslint_errors_reported_in_reason(self, tmp_path: Path) -> None:
+    def test_eslint_errors_reported_in_reason(self, ts_mocks) -> None:
         """ESLint errors and warnings are counted."""
-        ts_file = tmp_path / "app.ts"
-        ts_file.write_text("const x = 1;\n")
-
-        eslint_json = json.dumps([{
-            "filePath": str(ts_file),
-            "errorCount": 2,
-            "warningCount": 1,
-            "messages": [
-                {"line": 1, "ruleId": "no-unused-vars", "message": "x is unused", "severity": 2},
-                {"line": 2, "ruleId": "no-console", "message": "no console", "severity": 2},
-                {"line": 3, "ruleId": "semi", "message": "missing semi", "severity": 1},
-            ],
-        }])
-
-        mock_prettier = MagicMock(returncode=0, stdout="", stderr="")
-        mock_eslint = MagicMock(returncode=1, stdout=eslint_json, stderr="")
-
-        def run_side_effect(cmd, **_kwargs):
-            if "eslint" in cmd[0]:
-                return mock_eslint
-            return mock_prettier
-
-        with (
-            patch("_checkers.typescript.check_file_length", return_value=""),
-            patch("_checkers.typescript.find_project_root", return_value=None),
-            patch("_checkers.typescript.find_tool", side_effect=lambda name, _: f"/usr/bin/{name}" if name in ("prettier", "eslint") else None),
-            patch("_checkers.typescript.subprocess.run", side_effect=run_side_effect),
-        ):
-            exit_code, reason = check_typescript(ts_file)
+        eslint_json = json.dumps(
+            [
+                {
+                    "filePath": "app.ts",
+                    "errorCount": 2,
+                    "warningCount": 1,
+                    "messages": [
+                        {"line": 1, "ruleId": "no-unused-vars", "message": "x is unused", "severity": 2},
+                        {"line": 2, "ruleId": "no-console", "message": "no console", "severity": 2},
+                        {"line": 3, "ruleId": "semi", "message": "missing semi", "severity": 1},
+                    ],
+                }
+            ]
+        ).encode()
+        ts_mocks.run.return_value = subprocess.CompletedProcess([], returncode=1, stdout=eslint_json, stderr=b"")
+
+        exit_code, reason = check_typescript(Path("app.ts"))
 
         assert exit_code == 0
         assert "3 eslint" in reason
+        assert "  app.ts:1 [error] no-unused-vars: x is unused" in reason
+        assert "  app.ts:3 [warn] semi: missing semi" in reason
 
 
-class TestCheckTypescriptCleanFile:
-    """Clean files should pass."""
+class TestCheckTypescriptEslintDaemon:
+    """eslint_d is preferred over eslint when available."""
 
-    def test_clean_file_returns_success(self, tmp_path: Path) -> None:
-        """Clean TS file returns exit 0 with empty reason."""
-        ts_file = tmp_path / "app.ts"
-        ts_file.write_text("const x = 1;\n")
+    def test_uses_eslint_d_when_available(self, ts_mocks) -> None:
+        """The daemonized eslint_d binary is invoked instead of eslint."""
+        ts_mocks.find_tool.side_effect = _tools("prettier", "eslint", "eslint_d")
+
+        check_typescript(Path("app.ts"))
 
-        eslint_json = json.dumps([{"filePath": str(ts_file), "errorCount": 0, "warningCount": 0, "messages": []}])
+        invoked_binaries = [cmd[0] for cmd in _invoked(ts_mocks)]
+        assert "/usr/bin/eslint_d" in invoked_binaries
+        assert "/usr/bin/eslint" not in invoked_binaries
 
-        mock_prettier = MagicMock(returncode=0, stdout="", stderr="")
-        mock_eslint = MagicMock(returncode=0, stdout=eslint_json, stderr="")
 
-        def run_side_effect(cmd, **_kwargs):
-            if "eslint" in cmd[0]:
-                return mock_eslint
-            return mock_prettier
+class TestCheckTypescriptCleanFile:
+    """Clean files should pass."""
 
-        with (
-            patch("_checkers.typescript.check_file_length", return_value=""),
-            patch("_checkers.typescript.find_project_root", return_value=None),
-            patch("_checkers.typescript.find_tool", side_effect=lambda name, _: f"/usr/bin/{name}" if name in ("prettier", "eslint") else None),
-            patch("_checkers.typescript.subprocess.run", side_effect=run_side_effect),
-        ):
-            exit_code, reason = check_typescript(ts_file)
+    def test_clean_file_returns_success(self, ts_mocks) -> None:
+        """Clean TS file returns exit 0 with empty reason."""
+        exit_code, reason = check_typescript(Path("app.ts"))
 
         assert exit_code == 0
         assert reason == ""
+        assert len(_invoked(ts_mocks)) == 2
 
 
 class TestCheckTypescriptCommentsPreserved:
     """Regression test: check_typescript must not strip comments from user files."""
 
-    def test_regular_comment_survives_check(self, tmp_path: Path) -> None:
+    def test_regular_comment_survives_check(self, tmp_path: Path, ts_mocks) -> None:
         """Regular comments are preserved after check_typescript runs."""
         ts_file = tmp_path / "app.ts"
         ts_file.write_text("const x = 1; // important doc comment\n")
+        ts_mocks.find_tool.side_effect = _tools()
 
-        with (
-            patch("_checkers.typescript.check_file_length", return_value=""),
-            patch("_checkers.typescript.find_project_root", return_value=None),
-            patch("_checkers.typescript.find_tool", return_value=None),
-        ):
-            check_typescript(ts_file)
+        check_typescript(ts_file)
 
         assert "// important doc comment" in ts_file.read_text()
 
@@ -216,30 +217,11 @@ class TestCheckTypescriptCommentsPreserved:
 class TestCheckTypescriptTscNotCalled:
     """Verify tsc is NOT called (removed from per-edit hooks)."""
 
-    def test_tsc_not_invoked_even_if_available(self, tmp_path: Path) -> None:
+    def test_tsc_not_invoked_even_if_available(self, ts_mocks) -> None:
         """Even when tsc is on PATH, it is not called."""
-        ts_file = tmp_path / "app.ts"
-        ts_file.write_text("const x = 1;\n")
-
-        eslint_json = json.dumps([{"filePath": str(ts_file), "errorCount": 0, "warningCount": 0, "messages": []}])
-        mock_prettier = MagicMock(returncode=0, stdout="", stderr="")
-        mock_eslint = MagicMock(returncode=0, stdout=eslint_json, stderr="")
-
-        called_commands: list[list[str]] = []
-
-        def run_side_effect(cmd, **_kwargs):
-            called_commands.append(cmd)
-            if "eslint" in cmd[0]:
-                return mock_eslint
-            return mock_prettier
+        ts_mocks.find_tool.side_effect = _tools("prettier", "eslint", "tsc")
 
-        with (
-            patch("_checkers.typescript.check_file_length", return_value=""),
-            patch("_checkers.typescript.find_project_root", return_value=None),
-            patch("_checkers.typescript.find_tool", side_effect=lambda name, _: f"/usr/bin/{name}"),
-            patch("_checkers.typescript.subprocess.run", side_effect=run_side_effect),
-        ):
-            check_typescript(ts_file)
+        check_typescript(Path("app.ts"))
 
-        invoked_binaries = [cmd[0] for cmd in called_commands]
+        invoked_binaries = [cmd[0] for cmd in _invoked(ts_mocks)]
         assert not any("tsc" in b for b in invoked_binaries)
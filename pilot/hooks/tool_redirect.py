@@ -10,12 +10,13 @@ Note: Task management tools (TaskCreate, TaskList, etc.) are ALLOWED.
 
 from __future__ import annotations
 
-import json
+import functools
+import re
 import sys
-from pathlib import Path
+from collections.abc import Callable
+from dataclasses import dataclass, field
 
-sys.path.insert(0, str(Path(__file__).parent))
-from _util import pre_tool_use_context, pre_tool_use_deny
+from _util import pre_tool_use_context, pre_tool_use_deny, read_hook_stdin
 
 SEMANTIC_PHRASES = [
     "where is",
@@ -53,138 +54,158 @@ CODE_PATTERNS = [
     "interface ",
 ]
 
+_CODE_RE = re.compile("|".join(re.escape(p) for p in CODE_PATTERNS), re.IGNORECASE)
+_SEMANTIC_RE = re.compile("|".join(re.escape(p) for p in SEMANTIC_PHRASES), re.IGNORECASE)
 
+
+@functools.cache
 def is_semantic_pattern(pattern: str) -> bool:
     """Check if a pattern appears to be a semantic/intent-based search.
 
     Returns True for natural language queries like "where is config loaded"
     Returns False for code patterns like "def save_config" or "class Handler"
     """
-    pattern_lower = pattern.lower()
+    if _CODE_RE.search(pattern):
+        return False
+    return _SEMANTIC_RE.search(pattern) is not None
 
-    for code_pattern in CODE_PATTERNS:
-        if code_pattern in pattern_lower:
-            return False
 
-    return any(phrase in pattern_lower for phrase in SEMANTIC_PHRASES)
+def _always(_tool_input: dict) -> bool:
+    return True
 
 
-EXPLORE_HINT = {
-    "message": "Consider using `vexor search` instead (better semantic ranking)",
-    "alternative": "vexor search for semantic codebase search, or Grep/Glob for exact patterns",
-    "example": 'vexor search "where is config loaded" --mode code --top 5',
-}
+@dataclass(frozen=True, slots=True)
+class Redirect:
+    """One block or hint: what to say, what to use instead, and when it applies.
 
-HINTS: dict[str, dict] = {
-    "Grep": {
-        "message": "Semantic pattern detected — `vexor search` may give better results",
-        "alternative": "vexor search for intent-based file discovery",
-        "example": 'vexor search "<pattern>" --mode code --top 5',
-        "condition": lambda data: is_semantic_pattern(
-            data.get("tool_input", {}).get("pattern", "") if isinstance(data.get("tool_input"), dict) else ""
-        ),
-    },
-    "Task": {
-        "message": "Consider using Read, Grep, Glob, Bash directly (less context overhead)",
-        "alternative": "Direct tool calls avoid sub-agent context cost",
-        "example": "Read/Grep/Glob for exploration, TaskCreate for tracking",
-        "condition": lambda data: (
-            data.get("tool_input", {}).get("subagent_type", "")
+    condition receives the normalized tool_input dict.
+    """
+
+    message: str
+    alternative: str
+    example: str
+    condition: Callable[[dict], bool] = _always
+    has_placeholder: bool = field(init=False)
+    stderr_banner: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "has_placeholder", "<pattern>" in self.example)
+        object.__setattr__(self, "stderr_banner", f"\033[0;31m[Pilot] {self.message}\033[0m\n")
+
+
+EXPLORE_HINT = Redirect(
+    message="Consider using `vexor search` instead (better semantic ranking)",
+    alternative="vexor search for semantic codebase search, or Grep/Glob for exact patterns",
+    example='vexor search "where is config loaded" --mode code --top 5',
+    condition=lambda tool_input: tool_input.get("subagent_type") == "Explore",
+)
+
+HINTS: dict[str, Redirect] = {
+    "Grep": Redirect(
+        message="Semantic pattern detected — `vexor search` may give better results",
+        alternative="vexor search for intent-based file discovery",
+        example='vexor search "<pattern>" --mode code --top 5',
+        condition=lambda tool_input: is_semantic_pattern(tool_input.get("pattern", "")),
+    ),
+    "Task": Redirect(
+        message="Consider using Read, Grep, Glob, Bash directly (less context overhead)",
+        alternative="Direct tool calls avoid sub-agent context cost",
+        example="Read/Grep/Glob for exploration, TaskCreate for tracking",
+        condition=lambda tool_input: (
+            tool_input.get("subagent_type", "")
             not in (
                 "Explore",
                 "pilot:plan-reviewer",
                 "pilot:spec-reviewer",
                 "claude-code-guide",
             )
-            if isinstance(data.get("tool_input"), dict)
-            else True
         ),
-    },
+    ),
 }
 
-BLOCKS: dict[str, dict] = {
-    "WebSearch": {
-        "message": "WebSearch is blocked (use MCP alternative)",
-        "alternative": "Use ToolSearch to load mcp__plugin_pilot_web-search__search, then call it directly",
-        "example": 'ToolSearch(query="+web-search search") then mcp__plugin_pilot_web-search__search(query="...")',
-    },
-    "WebFetch": {
-        "message": "WebFetch is blocked (truncates at ~8KB)",
-        "alternative": "Use ToolSearch to load mcp__plugin_pilot_web-fetch__fetch_url, then call it directly",
-        "example": 'ToolSearch(query="+web-fetch fetch") then mcp__plugin_pilot_web-fetch__fetch_url(url="...")',
-    },
-    "EnterPlanMode": {
-        "message": "BLOCKED: EnterPlanMode is FORBIDDEN. Plan mode is completely disabled in this project.",
-        "alternative": "Do NOT use plan mode under any circumstances. Use /spec for structured planning, or execute directly for simple tasks",
-        "example": "Skill(skill='spec', args='task description')",
-    },
-    "ExitPlanMode": {
-        "message": "BLOCKED: ExitPlanMode is FORBIDDEN. Plan mode is completely disabled in this project.",
-        "alternative": "Do NOT use plan mode under any circumstances. Use /spec for structured planning, or execute directly for simple tasks",
-        "example": "Skill(skill='spec', args='task description')",
-    },
-    "Task": {
-        "message": "Task(subagent_type='Plan') is blocked (project uses /spec workflow)",
-        "alternative": "Do planning work directly with Read, Grep, Glob tools. Use /spec for structured planning.",
-        "example": "Read files directly, use AskUserQuestion for decisions, write plan to file",
-        "condition": lambda data: (
-            isinstance(data.get("tool_input"), dict) and data["tool_input"].get("subagent_type") == "Plan"
-        ),
-    },
+BLOCKS: dict[str, Redirect] = {
+    "WebSearch": Redirect(
+        message="WebSearch is blocked (use MCP alternative)",
+        alternative="Use ToolSearch to load mcp__plugin_pilot_web-search__search, then call it directly",
+        example='ToolSearch(query="+web-search search") then mcp__plugin_pilot_web-search__search(query="...")',
+    ),
+    "WebFetch": Redirect(
+        message="WebFetch is blocked (truncates at ~8KB)",
+        alternative="Use ToolSearch to load mcp__plugin_pilot_web-fetch__fetch_url, then call it directly",
+        example='ToolSearch(query="+web-fetch fetch") then mcp__plugin_pilot_web-fetch__fetch_url(url="...")',
+    ),
+    "EnterPlanMode": Redirect(
+        message="BLOCKED: EnterPlanMode is FORBIDDEN. Plan mode is completely disabled in this project.",
+        alternative="Do NOT use plan mode under any circumstances. Use /spec for structured planning, or execute directly for simple tasks",
+        example="Skill(skill='spec', args='task description')",
+    ),
+    "ExitPlanMode": Redirect(
+        message="BLOCKED: ExitPlanMode is FORBIDDEN. Plan mode is completely disabled in this project.",
+        alternative="Do NOT use plan mode under any circumstances. Use /spec for structured planning, or execute directly for simple tasks",
+        example="Skill(skill='spec', args='task description')",
+    ),
+    "Task": Redirect(
+        message="Task(subagent_type='Plan') is blocked (project uses /spec workflow)",
+        alternative="Do planning work directly with Read, Grep, Glob tools. Use /spec for structured planning.",
+        example="Read files directly, use AskUserQuestion for decisions, write plan to file",
+        condition=lambda tool_input: tool_input.get("subagent_type") == "Plan",
+    ),
 }
 
 
-def _format_example(redirect_info: dict, pattern: str | None = None) -> str:
-    example = redirect_info["example"]
-    if pattern and "<pattern>" in example:
-        example = example.replace("<pattern>", pattern)
-    return example
+def _format_example(redirect_info: Redirect, pattern: str | None = None) -> str:
+    if pattern and redirect_info.has_placeholder:
+        return redirect_info.example.replace("<pattern>", pattern)
+    return redirect_info.example
 
 
-def block(redirect_info: dict, pattern: str | None = None) -> int:
+def block(redirect_info: Redirect, pattern: str | None = None) -> int:
     """Output deny JSON to stdout and return 2 (non-zero reinforces block)."""
     example = _format_example(redirect_info, pattern)
-    reason = f"{redirect_info['message']}\n-> {redirect_info['alternative']}\nExample: {example}"
-    sys.stderr.write(f"\033[0;31m[Pilot] {redirect_info['message']}\033[0m\n")
-    print(pre_tool_use_deny(reason))
+    reason = f"{redirect_info.message}\n-> {redirect_info.alternative}\nExample: {example}"
+    sys.stderr.write(redirect_info.stderr_banner)
+    sys.stdout.write(pre_tool_use_deny(reason) + "\n")
     return 2
 
 
-def hint(redirect_info: dict, pattern: str | None = None) -> int:
+def hint(redirect_info: Redirect, pattern: str | None = None) -> int:
     """Output additionalContext JSON to stdout and return 0."""
     example = _format_example(redirect_info, pattern)
-    context = f"{redirect_info['message']}\nExample: {example}"
-    print(pre_tool_use_context(context))
+    context = f"{redirect_info.message}\nExample: {example}"
+    sys.stdout.write(pre_tool_use_context(context) + "\n")
     return 0
 
 
+# Tool name -> (action, redirect) entries, checked in order:
+# the Explore hint first, then blocks, then hints.
+_DISPATCH: dict[str, tuple[tuple[Callable[[Redirect, str | None], int], Redirect], ...]] = {}
+
+
+def _register(tool_name: str, action: Callable[[Redirect, str | None], int], redirect: Redirect) -> None:
+    _DISPATCH[tool_name] = (*_DISPATCH.get(tool_name, ()), (action, redirect))
+
+
+_register("Task", hint, EXPLORE_HINT)
+for _name, _redirect in BLOCKS.items():
+    _register(_name, block, _redirect)
+for _name, _redirect in HINTS.items():
+    _register(_name, hint, _redirect)
+
+
 def run_tool_redirect() -> int:
     """Check if tool should be redirected (block) or hinted (allow)."""
-    try:
-        hook_data = json.load(sys.stdin)
-    except (json.JSONDecodeError, OSError):
+    hook_data = read_hook_stdin()
+    entries = _DISPATCH.get(hook_data.get("tool_name", ""))
+    if not entries:
         return 0
 
-    tool_name = hook_data.get("tool_name", "")
-    tool_input = hook_data.get("tool_input", {}) if isinstance(hook_data.get("tool_input"), dict) else {}
-
-    if tool_name == "Task" and tool_input.get("subagent_type") == "Explore":
-        return hint(EXPLORE_HINT)
-
-    if tool_name in BLOCKS:
-        redirect = BLOCKS[tool_name]
-        condition = redirect.get("condition")
-        if condition is None or condition(hook_data):
-            return block(redirect)
-
-    if tool_name in HINTS:
-        redirect = HINTS[tool_name]
-        condition = redirect.get("condition")
-        if condition is None or condition(hook_data):
-            pattern = None
-            if tool_name == "Grep":
-                pattern = tool_input.get("pattern", "") if isinstance(tool_input, dict) else ""
-            return hint(redirect, pattern)
+    tool_input = hook_data.get("tool_input")
+    if not isinstance(tool_input, dict):
+        tool_input = {}
+
+    for action, redirect in entries:
+        if redirect.condition(tool_input):
+            return action(redirect, tool_input.get("pattern"))
 
     return 0
 